@@ -1,10 +1,14 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from cachetools import TTLCache
 from fastapi import HTTPException, status, BackgroundTasks
 from fastapi.security import HTTPBearer
 import jwt
 from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from .models.user import User
 from .models.enums import UserRole, ExamCategory
 from .config import settings
@@ -15,6 +19,8 @@ import logging
 # import secrets
 from .services.otp_service import OTPService
 from .services.email_service import EmailService
+from .services import jwt_cache
+from .input_sanitizer import sanitizer
 from .db import init_beanie_if_needed  # Import the new function
 
 import re
@@ -24,12 +30,35 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is deliberately slow; run it here so it never stalls the event loop
+_PWD_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pwd")
 
 
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+# Derived once at import instead of on every token issued
+ACCESS_TOKEN_EXPIRES_IN = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_ACCESS_TOKEN_TTL = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TOKEN_TTL = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+# Built once instead of allocating a fresh list on every decode
+_JWT_ALGORITHMS = [ALGORITHM]
+
+# Password strength character classes, compiled once
+_UPPER_RE = re.compile(r"[A-Z]")
+_LOWER_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"\d")
+_SPECIAL_RE = re.compile(r"[!@#$%^&*(),.?\":{}|<>]")
+
+# Short-lived cache of authenticated users keyed by access token digest,
+# so back-to-back requests from the same client skip the Mongo lookup.
+# Holds private snapshots: every hit hands out its own copy, so handlers
+# may mutate the user they get without leaking into other requests
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# email -> monotonic time the user's cached entries were revoked; entries
+# cached before that instant are ignored. Lives as long as the cache TTL.
+_user_cache_revoked: TTLCache = TTLCache(maxsize=10_000, ttl=30)
 
 
 class TokenData(BaseModel):
@@ -40,7 +69,18 @@ class Token(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
-    expires_in: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    expires_in: int = ACCESS_TOKEN_EXPIRES_IN
+
+
+def _clean(sanitize, value: Any) -> Any:
+    """Run a sanitizer on raw string input, leaving other types to validation"""
+    return sanitize(value) if isinstance(value, str) else value
+
+
+def _clean_list(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_clean(sanitizer.sanitize_text, item) for item in value]
+    return value
 
 
 class UserRegisterRequest(BaseModel):
@@ -50,6 +90,33 @@ class UserRegisterRequest(BaseModel):
     password: str
     preferred_exam_categories: list[ExamCategory] = []
 
+    # Inputs are sanitized while parsing so the request is validated only once
+    @field_validator("name", mode="before")
+    @classmethod
+    def _sanitize_name(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_name, value)
+
+    @field_validator("email", mode="before")
+    @classmethod
+    def _sanitize_email(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_email, value)
+
+    @field_validator("phone", mode="before")
+    @classmethod
+    def _sanitize_phone(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_phone, value)
+
+    @field_validator("password", mode="before")
+    @classmethod
+    def _sanitize_password(cls, value: Any) -> Any:
+        # Stored hashes were computed over the escaped password, keep it that way
+        return _clean(sanitizer.sanitize_text, value)
+
+    @field_validator("preferred_exam_categories", mode="before")
+    @classmethod
+    def _sanitize_categories(cls, value: Any) -> Any:
+        return _clean_list(value)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -66,6 +133,16 @@ class UserLoginRequest(BaseModel):
     email: EmailStr
     password: str
 
+    @field_validator("email", mode="before")
+    @classmethod
+    def _sanitize_email(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_email, value)
+
+    @field_validator("password", mode="before")
+    @classmethod
+    def _sanitize_password(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_text, value)
+
     class Config:
         json_schema_extra = {
             "example": {"email": "john@example.com", "password": "SecurePassword123!"}
@@ -88,6 +165,10 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime] = None
 
 
+# Fields copied straight from User into UserResponse (id needs converting)
+_USER_RESPONSE_FIELDS = tuple(name for name in UserResponse.model_fields if name != "id")
+
+
 class PasswordResetRequest(BaseModel):
     email: EmailStr
 
@@ -99,19 +180,54 @@ class PasswordUpdateRequest(BaseModel):
 
 class ResetPasswordWithOTPRequest(BaseModel):
     email: EmailStr
-    otp: str
+    otp: str = Field(pattern=r"^\d{6}$")
     new_password: str
 
 
+class EmailRequest(BaseModel):
+    email: EmailStr
+
+
+class EmailOTPRequest(BaseModel):
+    email: EmailStr
+    otp: str = Field(pattern=r"^\d{6}$")
+
+    class Config:
+        json_schema_extra = {"example": {"email": "john@example.com", "otp": "123456"}}
+
+
+class ProfileUpdateRequest(BaseModel):
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    preferred_exam_categories: Optional[list[ExamCategory]] = None
+
+    @field_validator("name", mode="before")
+    @classmethod
+    def _sanitize_name(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_name, value)
+
+    @field_validator("phone", mode="before")
+    @classmethod
+    def _sanitize_phone(cls, value: Any) -> Any:
+        return _clean(sanitizer.sanitize_phone, value)
+
+    @field_validator("preferred_exam_categories", mode="before")
+    @classmethod
+    def _sanitize_categories(cls, value: Any) -> Any:
+        return _clean_list(value)
+
+
 class LoginResponse(BaseModel):
     message: str
     requires_verification: bool
-    user: Dict[str, Any]
+    user: UserResponse
     tokens: Optional[Token] = None
     dashboard_url: Optional[str] = None
 
 
 class AuthService:
+    access_expires_in: int = ACCESS_TOKEN_EXPIRES_IN
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
@@ -122,6 +238,20 @@ class AuthService:
         """Hash a password"""
         return pwd_context.hash(password)
 
+    @staticmethod
+    async def averify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash on the password thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _PWD_POOL, pwd_context.verify, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def aget_password_hash(password: str) -> str:
+        """Hash a password on the password thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_PWD_POOL, pwd_context.hash, password)
+
     @staticmethod
     def validate_password(password: str) -> bool:
         """
@@ -135,16 +265,16 @@ class AuthService:
         if len(password) < 8:
             return False
 
-        if not re.search(r"[A-Z]", password):
+        if not _UPPER_RE.search(password):
             return False
 
-        if not re.search(r"[a-z]", password):
+        if not _LOWER_RE.search(password):
             return False
 
-        if not re.search(r"\d", password):
+        if not _DIGIT_RE.search(password):
             return False
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        if not _SPECIAL_RE.search(password):
             return False
 
         return True
@@ -162,12 +292,7 @@ class AuthService:
     ) -> str:
         """Create JWT access token"""
         to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-            )
+        expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TOKEN_TTL)
 
         to_encode.update({"exp": expire, "type": "access"})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -177,11 +302,37 @@ class AuthService:
     def create_refresh_token(data: dict) -> str:
         """Create JWT refresh token"""
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = datetime.now(timezone.utc) + _REFRESH_TOKEN_TTL
         to_encode.update({"exp": expire, "type": "refresh"})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
+    @staticmethod
+    def create_token_pair(email: str, role: UserRole) -> Token:
+        """Create an access/refresh token pair for a user from one clock read"""
+        now = datetime.now(timezone.utc)
+        access_token = jwt.encode(
+            {
+                "sub": email,
+                "role": role.value,
+                "exp": now + _ACCESS_TOKEN_TTL,
+                "type": "access",
+            },
+            SECRET_KEY,
+            algorithm=ALGORITHM,
+        )
+        refresh_token = jwt.encode(
+            {"sub": email, "exp": now + _REFRESH_TOKEN_TTL, "type": "refresh"},
+            SECRET_KEY,
+            algorithm=ALGORITHM,
+        )
+        return Token(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+            expires_in=ACCESS_TOKEN_EXPIRES_IN,
+        )
+
     @staticmethod
     async def authenticate_user(email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
@@ -194,7 +345,9 @@ class AuthService:
             if not user:
                 return None
 
-            password_valid = AuthService.verify_password(password, user.password_hash)
+            password_valid = await AuthService.averify_password(
+                password, user.password_hash
+            )
 
             if not password_valid:
                 return None
@@ -205,6 +358,30 @@ class AuthService:
             # Re-raise to be handled by the caller
             raise
 
+    @staticmethod
+    def decode_token(token: str) -> Dict[str, Any]:
+        """Decode and verify a JWT, raising jwt.PyJWTError when invalid"""
+        return jwt_cache.get_or_decode(token, AuthService._decode_uncached)
+
+    @staticmethod
+    def _decode_uncached(token: str) -> Dict[str, Any]:
+        return jwt.decode(token, SECRET_KEY, algorithms=_JWT_ALGORITHMS)
+
+    @staticmethod
+    def access_token_claims(token: str) -> Dict[str, Any]:
+        """Verify an access token and return its claims without a user lookup"""
+        try:
+            payload = AuthService.decode_token(token)
+        except jwt.PyJWTError:
+            payload = {}
+        if payload.get("sub") is None or payload.get("type") != "access":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return payload
+
     @staticmethod
     async def verify_token(token: str) -> TokenData:
         """Verify JWT token and return token data"""
@@ -215,7 +392,7 @@ class AuthService:
         )
 
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = AuthService.decode_token(token)
             email: str = payload.get("sub")
             token_type: str = payload.get("type")
 
@@ -238,70 +415,104 @@ class AuthService:
         # Ensure database is initialized
         await init_beanie_if_needed()
 
-        user = await User.find_one({"email": email})
-        if not user:
-            logger.warning(f"User not found for OTP generation: {email}")
-            return False
-
         # Generate OTP
         otp = OTPService.generate_otp()
         expiry = OTPService.generate_otp_expiry()
         logger.info(f"📧 Generated OTP for {email}: {otp}")
 
-        # Update user with OTP (fast DB operation)
-        user.email_verification_otp = otp
-        user.email_verification_otp_expires_at = expiry
-        await user.save()
+        # Store OTP with a single targeted update instead of read + full save;
+        # matched_count tells us whether the user exists
+        result = await User.find_one({"email": email}).update(
+            {
+                "$set": {
+                    "email_verification_otp": otp,
+                    "email_verification_otp_expires_at": expiry,
+                }
+            }
+        )
+        if not result.matched_count:
+            logger.warning(f"User not found for OTP generation: {email}")
+            return False
         logger.info(f"✅ OTP stored in database for {email}")
 
-        # ✅ SEND EMAIL SYNCHRONOUSLY (await) - Don't rely on BackgroundTasks
-        # This ensures email is sent before response is returned
-        logger.info(f"📨 Sending OTP email to {email} (synchronously)...")
-        result = await EmailService.send_verification_email(email, otp)
-        
+        # Send after the response when the platform allows it; sync_send and
+        # serverless deployments still await the send before returning
+        logger.info(f"📨 Sending OTP email to {email}...")
+        result = await EmailService.deliver(
+            None if sync_send else background_tasks,
+            EmailService.send_verification_email,
+            email,
+            otp,
+        )
+
         if result:
-            logger.info(f"✅ OTP email sent successfully to {email}")
+            logger.info(f"✅ OTP email sent or queued for {email}")
         else:
             logger.error(f"❌ Failed to send OTP email to {email}")
         
         return result
 
     @staticmethod
-    async def verify_email_otp(email: str, otp: str) -> bool:
-        """Verify email OTP"""
+    async def update_user_fields(user: User, changes: Dict[str, Any]) -> None:
+        """Write only the given fields with $set, mirror them on the instance and drop cached copies"""
+        await User.find_one({"_id": user.id}).update({"$set": changes})
+        for field, value in changes.items():
+            setattr(user, field, value)
+        AuthService.invalidate_cached_user(user.email)
+
+    @staticmethod
+    async def verify_email_otp(email: str, otp: str) -> Optional[User]:
+        """Verify email OTP, returning the verified user on success"""
         # Ensure database is initialized
         await init_beanie_if_needed()
 
         user = await User.find_one({"email": email})
         if not user:
-            return False
+            return None
 
         # Check if OTP exists
         if not user.email_verification_otp:
-            return False
+            return None
 
-        # Check if OTP expired (using proper method that handles timezone issues)
-        if OTPService.is_otp_expired(user.email_verification_otp_expires_at):
-            return False
-
-        # Check if OTP matches
-        if user.email_verification_otp != otp:
-            return False
+        # Expiry is checked before the OTP itself is compared
+        if not OTPService.verify_otp(
+            user.email_verification_otp, user.email_verification_otp_expires_at, otp
+        ):
+            return None
 
         # Mark email as verified and clear OTP
-        user.is_verified = True
-        user.email_verification_otp = None
-        user.email_verification_otp_expires_at = None
-        await user.save()
-        return True
+        await AuthService.update_user_fields(
+            user,
+            {
+                "is_verified": True,
+                "email_verification_otp": None,
+                "email_verification_otp_expires_at": None,
+            },
+        )
+        return user
 
     @staticmethod
     async def get_current_user(token: str) -> User:
         """Get current user from JWT token"""
+        # Always verify the token so expiry is honoured on cache hits too
+        token_data = await AuthService.verify_token(token)
+
+        cache_key = jwt_cache.token_key(token)
+        cached = _user_cache.get(cache_key)
+        if cached is not None:
+            cached_at, snapshot = cached
+            revoked_at = _user_cache_revoked.get(snapshot.email)
+            if snapshot.email == token_data.email and (
+                revoked_at is None or cached_at > revoked_at
+            ):
+                return snapshot.model_copy(deep=True)
+
         # Ensure database is initialized
         await init_beanie_if_needed()
 
-        token_data = await AuthService.verify_token(token)
+        # Stamped before the read, so a revocation that lands while the
+        # lookup is in flight still invalidates what it returns
+        loaded_at = time.monotonic()
         user = await User.find_one({"email": token_data.email})
 
         if user is None:
@@ -316,8 +527,14 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
             )
 
+        _user_cache[cache_key] = (loaded_at, user.model_copy(deep=True))
         return user
 
+    @staticmethod
+    def invalidate_cached_user(email: str) -> None:
+        """Revoke every cached entry for a user (password change, logout, admin edits) in O(1)"""
+        _user_cache_revoked[email] = time.monotonic()
+
     @staticmethod
     async def register_user(
         user_data: UserRegisterRequest,
@@ -358,7 +575,7 @@ class AuthService:
             )
 
         # Hash password
-        hashed_password = AuthService.get_password_hash(user_data.password)
+        hashed_password = await AuthService.aget_password_hash(user_data.password)
 
         # Create new user
         new_user = User(
@@ -415,20 +632,13 @@ class AuthService:
             )
         else:
             # Fallback: update synchronously if no background_tasks
-            user.last_login = datetime.now(timezone.utc)
-            user.update_timestamp()
-            await user.save()
+            now = datetime.now(timezone.utc)
+            await AuthService.update_user_fields(
+                user, {"last_login": now, "updated_at": now}
+            )
 
         # Create tokens
-        access_token = AuthService.create_access_token(data={"sub": user.email})
-        refresh_token = AuthService.create_refresh_token(data={"sub": user.email})
-
-        token = Token(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        )
+        token = AuthService.create_token_pair(user.email, user.role)
 
         return user, token
 
@@ -437,29 +647,46 @@ class AuthService:
         """Helper to update last login timestamp in background"""
         try:
             await init_beanie_if_needed()
-            user = await User.find_one({"email": email})
-            if user:
-                user.last_login = datetime.now(timezone.utc)
-                user.update_timestamp()
-                await user.save()
+            now = datetime.now(timezone.utc)
+            await User.find_one({"email": email}).update(
+                {"$set": {"last_login": now, "updated_at": now}}
+            )
         except Exception as e:
             logger.warning(f"Failed to update last login for {email}: {str(e)}")
 
     @staticmethod
-    def convert_user_to_response(user: User) -> UserResponse:
-        """Convert User model to UserResponse"""
-        return UserResponse(
-            id=str(user.id),
-            name=user.name,
-            email=user.email,
-            phone=user.phone,
-            role=user.role,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            enrolled_courses=user.enrolled_courses,
-            preferred_exam_categories=user.preferred_exam_categories,
-            purchased_test_series=user.purchased_test_series,
-            has_premium_access=user.has_premium_access,
-            created_at=user.created_at,
-            last_login=user.last_login,
+    def _response_fingerprint(user: User) -> tuple:
+        """Cheap snapshot of the user state that UserResponse depends on"""
+        return (
+            user.updated_at,
+            user.last_login,
+            user.name,
+            user.email,
+            user.phone,
+            user.role,
+            user.is_active,
+            user.is_verified,
+            user.has_premium_access,
+            # Whole contents, so replacing an entry also changes the fingerprint
+            tuple(user.enrolled_courses),
+            tuple(user.preferred_exam_categories),
+            tuple(user.purchased_test_series),
         )
+
+    @staticmethod
+    def convert_user_to_response(user: User) -> UserResponse:
+        """Convert User model to UserResponse, reusing it while the user is unchanged"""
+        fingerprint = AuthService._response_fingerprint(user)
+        cached = user._response_cache
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        # Validated rather than constructed: fields set on the document after
+        # load (e.g. update_profile's JSON-mode values) are not re-validated
+        # by User, so enums may still be plain strings here. Validation also
+        # builds fresh lists, so the response never aliases the document
+        data = {field: getattr(user, field) for field in _USER_RESPONSE_FIELDS}
+        data["id"] = user.id_str
+        response = UserResponse.model_validate(data)
+        user._response_cache = (fingerprint, response)
+        return response
@@ -1,4 +1,5 @@
 import logging
+import os
 from pydantic_settings import BaseSettings
 
 # Set up logging for this module
@@ -8,6 +9,10 @@ logger = logging.getLogger(__name__)
 class Settings(BaseSettings):
     # Database
     MONGO_URI: str
+    MONGO_MAX_POOL_SIZE: int = 100  # Long-lived servers; serverless keeps a small pool
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: int = 300000  # Long-lived servers keep bursts' connections warm
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000  # How long a query may wait for a free connection
 
     # JWT Authentication
     JWT_SECRET_KEY: str
@@ -41,3 +46,9 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 settings = Settings()
+
+# Vercel / Lambda freeze the instance as soon as a response is returned
+IS_SERVERLESS = (
+    os.environ.get("VERCEL") == "1"
+    or os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+)
@@ -2,16 +2,17 @@
 import asyncio
 from urllib.parse import urlparse
 from typing import Optional
-import os
 import time
 import logging
+import warnings
 
 from pymongo.server_api import ServerApi
 from beanie import init_beanie
 import motor
 from motor.motor_asyncio import AsyncIOMotorClient
-from .config import settings
+from .config import settings, IS_SERVERLESS
 from .models.user import User
+from .models.user_session import UserSession
 from .models.question import Question
 from .models.test import TestSeries, TestSession, TestAttempt
 from .models.user_analytics import UserAnalytics
@@ -39,23 +40,37 @@ _init_in_progress = False  # Prevent race conditions
 _last_init_time = 0  # Track when we last initialized
 
 # Environment variable to track if we're in a serverless environment
-_is_serverless = os.environ.get("VERCEL") == "1" or os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+_is_serverless = IS_SERVERLESS
 
 
 async def _make_client() -> motor.motor_asyncio.AsyncIOMotorClient:
     """
     Create a Motor client optimized for Vercel serverless environment.
     """
+    # Prefer zstd where the server and driver support it; pymongo drops it
+    # (with a warning) when the zstd module is missing, leaving zlib
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", message="Wire protocol compression with zstandard"
+        )
+        return _new_client()
+
+
+def _new_client() -> motor.motor_asyncio.AsyncIOMotorClient:
     return motor.motor_asyncio.AsyncIOMotorClient(
         settings.MONGO_URI,
         # Serverless-optimized settings
         serverSelectionTimeoutMS=3000,
         connectTimeoutMS=3000,
         socketTimeoutMS=10000,
-        maxPoolSize=5 if _is_serverless else 10,  # Slightly larger pool for serverless
-        minPoolSize=1 if _is_serverless else 0,   # Keep at least one connection alive
-        maxIdleTimeMS=30000,            # Keep connections alive longer
-        waitQueueTimeoutMS=3000,
+        # Small pool per serverless instance; long-lived servers keep warm connections
+        maxPoolSize=5 if _is_serverless else settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=1 if _is_serverless else settings.MONGO_MIN_POOL_SIZE,
+        # Serverless instances are short-lived, so idle connections go quickly;
+        # long-lived servers keep the connections opened by bursts such as
+        # concurrent CSV chunk inserts instead of re-handshaking TLS for each
+        maxIdleTimeMS=30000 if _is_serverless else settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=3000 if _is_serverless else settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
         appname="pariksha-path-vercel",
         tls=True,
         tlsAllowInvalidCertificates=False,
@@ -63,7 +78,7 @@ async def _make_client() -> motor.motor_asyncio.AsyncIOMotorClient:
         # Additional serverless optimizations
         retryWrites=True,               # Enable retries for reliability
         retryReads=True,                # Enable read retries
-        compressors="zlib",
+        compressors="zstd,zlib",
     )
 
 
@@ -148,6 +163,7 @@ async def init_beanie_if_needed() -> None:
                 database=db,
                 document_models=[
                     User,
+                    UserSession,
                     Question,
                     TestAttempt,
                     TestSeries,
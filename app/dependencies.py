@@ -1,12 +1,13 @@
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from .models.user import User
 from .models.enums import UserRole
 from .auth import AuthService
 from .db import init_db
+from .rate_limiter import otp_send_limiter, otp_verify_limiter, client_ip
 
 # Security setup
 security = HTTPBearer()
@@ -26,7 +27,6 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> User:
     """Get current user from JWT token"""
-    print(credentials)
     return await AuthService.get_current_user(credentials.credentials)
 
 
@@ -39,6 +39,24 @@ async def get_current_user_optional(
     return await AuthService.get_current_user(credentials.credentials)
 
 
+async def is_admin_request(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> bool:
+    """
+    True if the request carries an admin access token. Uses the token's
+    role claim and skips the user lookup; tokens issued before the claim
+    existed fall back to loading the user.
+    """
+    if not credentials:
+        return False
+    claims = AuthService.access_token_claims(credentials.credentials)
+    role = claims.get("role")
+    if role is None:
+        user = await AuthService.get_current_user(credentials.credentials)
+        role = user.role
+    return role == UserRole.ADMIN
+
+
 # Admin-only middleware
 async def admin_required(current_user: User = Depends(get_current_user)):
     """Check if current user has admin role"""
@@ -48,3 +66,19 @@ async def admin_required(current_user: User = Depends(get_current_user)):
             detail="Admin access required",
         )
     return current_user
+
+
+async def limit_otp_send(
+    request: Request, current_user: User = Depends(get_current_user)
+) -> None:
+    """Throttle verification email sends per user and per client IP"""
+    otp_send_limiter.check(f"user:{current_user.id_str}", f"ip:{client_ip(request)}")
+
+
+async def limit_otp_verify(
+    request: Request, current_user: User = Depends(get_current_user)
+) -> None:
+    """Throttle OTP verification attempts per user and per client IP"""
+    otp_verify_limiter.check(
+        f"user:{current_user.id_str}", f"ip:{client_ip(request)}"
+    )
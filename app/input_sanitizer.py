@@ -20,6 +20,18 @@ class InputSanitizer:
         r'<meta[^>]*>',
     ]
 
+    # Compiled once; applied in the same order as XSS_PATTERNS
+    _XSS_REGEXES = [
+        re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in XSS_PATTERNS
+    ]
+    _EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    _PHONE_STRIP_RE = re.compile(r'[^\d+]')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _UPPER_RE = re.compile(r'[A-Z]')
+    _LOWER_RE = re.compile(r'[a-z]')
+    _DIGIT_RE = re.compile(r'\d')
+    _SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
     # Allowed HTML tags and attributes for rich text (if needed)
     ALLOWED_TAGS = [
         'p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
@@ -50,8 +62,8 @@ class InputSanitizer:
         escaped = html.escape(text)
 
         # Remove potential XSS patterns
-        for pattern in InputSanitizer.XSS_PATTERNS:
-            escaped = re.sub(pattern, '', escaped, flags=re.IGNORECASE | re.DOTALL)
+        for regex in InputSanitizer._XSS_REGEXES:
+            escaped = regex.sub('', escaped)
 
         return escaped.strip()
 
@@ -87,7 +99,7 @@ class InputSanitizer:
         email = InputSanitizer.sanitize_text(email)
 
         # Basic email format check (should match backend validation)
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if not InputSanitizer._EMAIL_RE.match(email):
             return ""
 
         return email
@@ -99,7 +111,7 @@ class InputSanitizer:
             return ""
 
         # Remove all non-digit characters except + for international
-        phone = re.sub(r'[^\d+]', '', phone)
+        phone = InputSanitizer._PHONE_STRIP_RE.sub('', phone)
 
         # Basic length check (should match backend validation)
         if len(phone) < 10 or len(phone) > 15:
@@ -117,7 +129,7 @@ class InputSanitizer:
         name = InputSanitizer.sanitize_text(name)
 
         # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
+        name = InputSanitizer._WHITESPACE_RE.sub(' ', name).strip()
 
         # Basic length check
         if len(name) < 1 or len(name) > 100:
@@ -150,15 +162,16 @@ class InputSanitizer:
         for key, value in data.items():
             if isinstance(value, str):
                 # Choose appropriate sanitization based on field name
-                if 'email' in key.lower():
+                lowered = key.lower()
+                if 'email' in lowered:
                     sanitized[key] = self.sanitize_email(value)
-                elif 'phone' in key.lower():
+                elif 'phone' in lowered:
                     sanitized[key] = self.sanitize_phone(value)
-                elif 'name' in key.lower() or 'title' in key.lower():
+                elif 'name' in lowered or 'title' in lowered:
                     sanitized[key] = self.sanitize_name(value)
-                elif 'url' in key.lower() or 'link' in key.lower() or 'href' in key.lower():
+                elif 'url' in lowered or 'link' in lowered or 'href' in lowered:
                     sanitized[key] = self.sanitize_url(value)
-                elif 'content' in key.lower() or 'description' in key.lower() or 'message' in key.lower():
+                elif 'content' in lowered or 'description' in lowered or 'message' in lowered:
                     sanitized[key] = self.sanitize_html(value)
                 else:
                     sanitized[key] = self.sanitize_text(value)
@@ -184,16 +197,16 @@ class InputSanitizer:
         if len(password) < 8:
             return False, "Password must be at least 8 characters long"
 
-        if not re.search(r'[A-Z]', password):
+        if not InputSanitizer._UPPER_RE.search(password):
             return False, "Password must contain at least one uppercase letter"
 
-        if not re.search(r'[a-z]', password):
+        if not InputSanitizer._LOWER_RE.search(password):
             return False, "Password must contain at least one lowercase letter"
 
-        if not re.search(r'\d', password):
+        if not InputSanitizer._DIGIT_RE.search(password):
             return False, "Password must contain at least one number"
 
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not InputSanitizer._SPECIAL_RE.search(password):
             return False, "Password must contain at least one special character"
 
         return True, "Password is strong"
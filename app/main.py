@@ -1,13 +1,18 @@
 from typing import List, Optional, AsyncIterator
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from datetime import datetime
+import atexit
 import logging
+import logging.handlers
+import queue
 
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from .db import init_db
+from .config import IS_SERVERLESS
 import uvicorn
 from .models.user import User
 from .models.enums import UserRole, ExamCategory
@@ -39,6 +44,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _start_queue_logging() -> Optional[logging.handlers.QueueListener]:
+    """
+    Hand log records to a background thread so request handlers never block
+    on stream I/O. Serverless instances are frozen right after a response,
+    which could strand queued records, so they keep writing synchronously.
+    """
+    root = logging.getLogger()
+    if IS_SERVERLESS or not root.handlers:
+        return None
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *root.handlers, respect_handler_level=True
+    )
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    # Flush anything still queued before the process exits
+    atexit.register(listener.stop)
+    return listener
+
+
+_log_listener = _start_queue_logging()
+
+
 # Lifespan context manager for startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
@@ -68,6 +96,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Shutdown - In serverless, connections are automatically cleaned up
     # No need to explicitly close connections as they're per-request in serverless
     logger.info("🔄 Shutting down FastAPI application...")
+    if not IS_SERVERLESS:
+        from .db import close_client
+        from .services.course_question_service import csv_executor
+
+        close_client()
+        csv_executor.shutdown(wait=False, cancel_futures=True)
     logger.info("✅ Serverless function completed")
 
 
@@ -78,6 +112,8 @@ app = FastAPI(
     description="Backend API for My Parikshapath",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson encodes responses (including datetimes) natively and much faster
+    default_response_class=ORJSONResponse,
     # Security configurations
     max_request_size=10 * 1024 * 1024,  # 10MB max request size
     redoc_url="/docs",
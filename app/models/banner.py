@@ -1,5 +1,5 @@
-from beanie import Document 
-from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -13,3 +13,16 @@ class Banner(Document):
 
     class Settings:
         name = "banners"   # collection name
+
+
+class BannerListView(BaseModel):
+    """Projection of the fields returned by the public banner listing"""
+
+    id: PydanticObjectId = Field(alias="_id", serialization_alias="id")
+    title: Optional[str] = None
+    image_url: str
+    position: int = 0
+    is_active: bool = True
+    created_at: datetime
+
+    model_config = {"populate_by_name": True}
@@ -1,5 +1,5 @@
-from beanie import Document
-from pydantic import Field, EmailStr
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
 from datetime import datetime, timezone
 
@@ -19,3 +19,17 @@ class Contact(Document):
 
     def update_timestamp(self):
         self.updated_at = datetime.now(timezone.utc)
+
+
+class ContactListView(BaseModel):
+    """Projection of the fields returned by the contact submissions listing"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    email: EmailStr
+    phone: str
+    message: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"populate_by_name": True}
@@ -1,8 +1,21 @@
-from beanie import Document
-from pydantic import Field, BaseModel, field_validator
+from beanie import (
+    Delete,
+    Document,
+    Insert,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+    before_event,
+)
+from pydantic import Field, BaseModel, field_validator, model_validator
+from pymongo import IndexModel
 from typing import List, Optional
 from datetime import datetime, timezone
 from .enums import ExamCategory
+from ..services import course_cache
 import uuid
 
 
@@ -52,6 +65,69 @@ class Section(BaseModel):
         return v.strip()
 
 
+def discounted_price(price: float, discount_percent: Optional[float]) -> float:
+    """Price after applying an optional percentage discount"""
+    if not discount_percent:
+        return price
+    return price - (price * discount_percent) / 100
+
+
+# Same computation as discounted_price, for pipeline updates
+FINAL_PRICE_EXPR = {
+    "$subtract": [
+        "$price",
+        {
+            "$divide": [
+                {"$multiply": ["$price", {"$ifNull": ["$discount_percent", 0]}]},
+                100,
+            ]
+        },
+    ]
+}
+
+# Names of a course's sections, for projections; legacy documents store
+# sections as plain strings
+SECTION_NAMES_EXPR = {
+    "$map": {
+        "input": {"$ifNull": ["$sections", []]},
+        "in": {"$ifNull": ["$$this.name", "$$this"]},
+    }
+}
+
+
+def _sections_from_strings(v):
+    """Convert legacy string sections to Section objects"""
+    if not v:
+        return v
+
+    # Handle case where v might be None or contain None values
+    if v is None:
+        return []
+
+    # Filter out None values and empty strings
+    filtered_sections = [s for s in v if s is not None and str(s).strip()]
+
+    if not filtered_sections:
+        return []
+
+    # If sections are strings, convert them to Section objects
+    if isinstance(filtered_sections[0], str):
+        section_objects = []
+        for i, section_name in enumerate(filtered_sections):
+            section_objects.append(
+                Section(
+                    name=section_name.strip(),
+                    description=f"Section {i + 1}: {section_name}",
+                    order=i + 1,
+                    question_count=0,
+                    is_active=True,
+                )
+            )
+        return section_objects
+
+    return filtered_sections
+
+
 class Course(Document):
     # Basic info
     title: str
@@ -77,35 +153,7 @@ class Course(Document):
     @field_validator("sections", mode="before")
     def convert_string_sections_to_objects(cls, v):
         """Convert string sections to Section objects during migration"""
-        if not v:
-            return v
-
-        # Handle case where v might be None or contain None values
-        if v is None:
-            return []
-
-        # Filter out None values and empty strings
-        filtered_sections = [s for s in v if s is not None and str(s).strip()]
-
-        if not filtered_sections:
-            return []
-
-        # If sections are strings, convert them to Section objects
-        if isinstance(filtered_sections[0], str):
-            section_objects = []
-            for i, section_name in enumerate(filtered_sections):
-                section_objects.append(
-                    Section(
-                        name=section_name.strip(),
-                        description=f"Section {i + 1}: {section_name}",
-                        order=i + 1,
-                        question_count=0,
-                        is_active=True,
-                    )
-                )
-            return section_objects
-
-        return filtered_sections
+        return _sections_from_strings(v)
 
     @field_validator("sections")
     def validate_section_names_unique(cls, v):
@@ -217,6 +265,7 @@ class Course(Document):
     price: float
     is_free: bool = False
     discount_percent: Optional[float] = None
+    final_price: Optional[float] = None  # Price after discount, kept in sync on write
 
     # Resources
     material_ids: List[str] = []  # References to study materials
@@ -241,6 +290,127 @@ class Course(Document):
 
     class Settings:
         name = "courses"
+        indexes = [
+            IndexModel([("code", 1)], unique=True),  # Course codes are unique
+            # Listing sort order; keyset pagination ranges over this
+            [("priority_order", 1), ("category", 1), ("title", 1), ("_id", 1)],
+            # Public listings always filter on is_active, usually plus one of these
+            [("is_active", 1), ("category", 1), ("priority_order", 1)],
+            [("is_active", 1), ("is_free", 1), ("priority_order", 1)],
+            IndexModel(
+                [("title", "text"), ("description", "text")],
+                weights={"title": 5, "description": 1},
+                name="course_text_idx",
+            ),
+        ]
 
     def update_timestamp(self):
         self.updated_at = datetime.now(timezone.utc)
+
+    @before_event(Insert, Replace, Save, SaveChanges)
+    def set_final_price(self):
+        self.final_price = discounted_price(self.price, self.discount_percent)
+
+    @after_event(Insert, Replace, Save, SaveChanges, Update, Delete)
+    def clear_listing_cache(self):
+        """Any write to a course makes cached course listings stale"""
+        course_cache.invalidate()
+
+
+class CourseListView(BaseModel):
+    """Projection of the course fields rendered by listings"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    code: str
+    category: ExamCategory
+    sub_category: str
+    description: str
+    sections: List[Section] = []
+    price: float
+    is_free: bool = False
+    discount_percent: Optional[float] = None
+    final_price: Optional[float] = None
+    validity_period_days: int = 365
+    mock_test_timer_seconds: int = 3600
+    material_ids: List[str] = []
+    icon_url: Optional[str] = None
+    banner_url: Optional[str] = None
+    priority_order: int = 0
+    is_active: bool = True
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"populate_by_name": True}
+
+    @field_validator("sections", mode="before")
+    def convert_string_sections_to_objects(cls, v):
+        return _sections_from_strings(v)
+
+    @model_validator(mode="after")
+    def fill_final_price(self):
+        # Documents written before final_price existed
+        if self.final_price is None:
+            self.final_price = discounted_price(self.price, self.discount_percent)
+        return self
+
+    def get_section_names(self) -> List[str]:
+        """Get list of section names"""
+        return [section.name for section in self.sections]
+
+
+class CourseEnrollmentView(BaseModel):
+    """Projection of the course fields needed to decide an enrollment"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    price: float
+    is_free: bool = False
+    discount_percent: Optional[float] = None
+    final_price: Optional[float] = None
+    validity_period_days: int = 365
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def fill_final_price(self):
+        # Documents written before final_price existed
+        if self.final_price is None:
+            self.final_price = discounted_price(self.price, self.discount_percent)
+        return self
+
+
+class CourseEnrolledView(BaseModel):
+    """
+    Projection of the course fields shown in a student's enrolled list.
+    Sections are reduced to their names on the server, so section files are
+    never loaded.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    code: str
+    category: ExamCategory
+    sub_category: str
+    description: str
+    section_names: List[str] = []
+    icon_url: Optional[str] = None
+    material_ids: List[str] = []
+    test_series_ids: List[str] = []
+
+    class Settings:
+        projection = {
+            "_id": 1,
+            "title": 1,
+            "code": 1,
+            "category": 1,
+            "sub_category": 1,
+            "description": 1,
+            "section_names": SECTION_NAMES_EXPR,
+            "icon_url": 1,
+            "material_ids": 1,
+            "test_series_ids": 1,
+        }
+
+    @field_validator("section_names", mode="before")
+    def drop_empty_names(cls, v):
+        return [name for name in v or [] if isinstance(name, str) and name.strip()]
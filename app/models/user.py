@@ -1,6 +1,7 @@
-from beanie import Document
-from pydantic import EmailStr, Field
-from typing import List, Optional, Dict, Any
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel
+from pydantic import BaseModel, EmailStr, Field, PrivateAttr
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
 from .enums import UserRole, ExamCategory
 
@@ -50,8 +51,32 @@ class User(Document):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_login: Optional[datetime] = None
 
+    # (fingerprint, UserResponse) memoised by AuthService.convert_user_to_response
+    _response_cache: Optional[Tuple[Any, Any]] = PrivateAttr(default=None)
+    _id_str: Optional[str] = PrivateAttr(default=None)
+
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("email", 1)], unique=True),  # Every auth lookup is by email
+            "phone",  # Duplicate phone checks on register / profile update
+        ]
+
+    @property
+    def id_str(self) -> Optional[str]:
+        """Hex string form of the id, computed once per loaded document"""
+        if self._id_str is None and self.id is not None:
+            self._id_str = str(self.id)
+        return self._id_str
 
     def update_timestamp(self):
         self.updated_at = datetime.now(timezone.utc)
+
+
+class UserAuthStatus(BaseModel):
+    """Projection of the fields needed to authorise a token refresh"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    email: EmailStr
+    role: UserRole = UserRole.STUDENT
+    is_active: bool
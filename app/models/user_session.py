@@ -1,6 +1,6 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import hashlib
 import json
@@ -46,6 +46,14 @@ class UserSession(Document):
 
     class Settings:
         name = "user_sessions"
+        indexes = [
+            # Not unique: tokens minted for a user in the same second are identical
+            "refresh_token_hash",
+            # Active-session listings and logout-all, newest activity first
+            [("user_id", 1), ("is_active", 1), ("last_activity", -1)],
+            # Expired-session cleanup
+            [("is_active", 1), ("expires_at", 1)],
+        ]
 
     def update_activity(self):
         """Update last activity timestamp"""
@@ -113,12 +121,11 @@ class UserSession(Document):
     @classmethod
     async def blacklist_refresh_token(cls, refresh_token: str) -> bool:
         """Blacklist a refresh token by marking its session as inactive"""
-        session = await cls.find_active_session_by_refresh_token(refresh_token)
-        if session:
-            session.deactivate()
-            await session.save()
-            return True
-        return False
+        token_hash = cls.hash_refresh_token(refresh_token)
+        modified = await cls._deactivate_many(
+            {"refresh_token_hash": token_hash, "is_active": True}
+        )
+        return modified > 0
 
     @classmethod
     async def get_user_active_sessions(cls, user_id: str) -> list["UserSession"]:
@@ -132,24 +139,52 @@ class UserSession(Document):
     @classmethod
     async def invalidate_all_user_sessions(cls, user_id: str) -> int:
         """Invalidate all active sessions for a user"""
-        sessions = await cls.get_user_active_sessions(user_id)
-        for session in sessions:
-            session.deactivate()
-            await session.save()
-        return len(sessions)
+        return await cls._deactivate_many({"user_id": user_id, "is_active": True})
 
     @classmethod
     async def cleanup_expired_sessions(cls) -> int:
         """Clean up expired sessions (for background task)"""
-        expired_sessions = await cls.find(
+        return await cls._deactivate_many(
             {"expires_at": {"$lt": datetime.now(timezone.utc)}, "is_active": True}
-        ).to_list()
+        )
 
-        for session in expired_sessions:
-            session.deactivate()
-            await session.save()
+    @classmethod
+    async def deactivate_owned_session(
+        cls, session_id: PydanticObjectId, user_id: str
+    ) -> int:
+        """Deactivate a session only if it is active and belongs to user_id"""
+        return await cls._deactivate_many(
+            {"_id": session_id, "user_id": user_id, "is_active": True}
+        )
 
-        return len(expired_sessions)
+    @classmethod
+    async def deactivate_sessions(cls, session_ids: List[PydanticObjectId]) -> int:
+        """Deactivate the given sessions in one update"""
+        if not session_ids:
+            return 0
+        return await cls._deactivate_many(
+            {"_id": {"$in": session_ids}, "is_active": True}
+        )
+
+    @classmethod
+    async def _deactivate_many(cls, query: Dict[str, Any]) -> int:
+        """
+        Deactivate every session matching `query` with one update_many,
+        appending the same activity entry deactivate() would (capped at 10).
+        """
+        log_entry = {
+            "timestamp": datetime.now(timezone.utc),
+            "action": "session_deactivated",
+            "description": "Session manually deactivated",
+            "metadata": {},
+        }
+        result = await cls.find(query).update(
+            {
+                "$set": {"is_active": False},
+                "$push": {"activity_log": {"$each": [log_entry], "$slice": -10}},
+            }
+        )
+        return result.modified_count if result else 0
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary for API responses"""
@@ -167,3 +202,56 @@ class UserSession(Document):
             "suspicious_activity": self.suspicious_activity,
             "activity_count": len(self.activity_log),
         }
+
+
+class UserSessionView(BaseModel):
+    """
+    Read-only projection of a session for listings. The activity log is
+    reduced to its length on the server instead of being loaded.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: str
+    device_info: Dict[str, Any] = Field(default_factory=dict)
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    location: Optional[Dict[str, Any]] = None
+    is_active: bool = True
+    last_activity: datetime
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+    suspicious_activity: bool = False
+    activity_count: int = 0
+
+    class Settings:
+        projection = {
+            "_id": 1,
+            "user_id": 1,
+            "device_info": 1,
+            "ip_address": 1,
+            "user_agent": 1,
+            "location": 1,
+            "is_active": 1,
+            "last_activity": 1,
+            "created_at": 1,
+            "expires_at": 1,
+            "suspicious_activity": 1,
+            "activity_count": {"$size": {"$ifNull": ["$activity_log", []]}},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as UserSession.to_dict"""
+        return {
+            "id": str(self.id),
+            "user_id": self.user_id,
+            "device_info": self.device_info,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "location": self.location,
+            "is_active": self.is_active,
+            "last_activity": self.last_activity,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "suspicious_activity": self.suspicious_activity,
+            "activity_count": self.activity_count,
+        }
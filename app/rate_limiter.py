@@ -0,0 +1,69 @@
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+
+
+class RateLimiter:
+    """
+    In-process sliding window rate limiter.
+
+    Each key (user id, client IP, email, ...) may be hit at most `times`
+    times per `seconds`. Idle keys expire from the underlying TTLCache, so
+    memory stays bounded by `maxsize`.
+    """
+
+    def __init__(self, times: int, seconds: int, maxsize: int = 10_000):
+        self.times = times
+        self.seconds = seconds
+        self._hits: TTLCache = TTLCache(maxsize=maxsize, ttl=seconds)
+
+    def _window(self, key: str, now: float) -> Deque[float]:
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = deque()
+        cutoff = now - self.seconds
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        return hits
+
+    def check(self, *keys: str) -> None:
+        """
+        Record a hit against every key, or raise 429 if any key is exhausted.
+
+        A rejected request is not counted, so a client that backs off
+        regains access once its oldest hit leaves the window.
+        """
+        now = time.monotonic()
+        windows = [(key, self._window(key, now)) for key in keys]
+
+        retry_after: Optional[float] = None
+        for _, hits in windows:
+            if len(hits) >= self.times:
+                wait = hits[0] + self.seconds - now
+                retry_after = wait if retry_after is None else max(retry_after, wait)
+
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+        for key, hits in windows:
+            hits.append(now)
+            self._hits[key] = hits
+
+
+def client_ip(request: Request) -> str:
+    """Best-effort client address used as a rate limit key"""
+    return request.client.host if request.client else "unknown"
+
+
+# Verification OTP emails: each send costs an SMTP round trip
+otp_send_limiter = RateLimiter(times=3, seconds=600)
+
+# OTP checks: bounds guessing against any one account and from any one client
+otp_verify_limiter = RateLimiter(times=10, seconds=60)
@@ -28,7 +28,7 @@ async def create_admin(
     """Create a new admin account (Admin only)"""
     try:
         # Create admin user
-        hashed_password = AuthService.get_password_hash(admin_data.password)
+        hashed_password = await AuthService.aget_password_hash(admin_data.password)
         new_admin = User(
             name=admin_data.name,
             email=admin_data.email,
@@ -42,7 +42,7 @@ async def create_admin(
 
         # Log the admin creation
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "users",
             str(new_admin.id),
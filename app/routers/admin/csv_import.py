@@ -119,7 +119,7 @@ async def import_questions_from_csv(
             subject=subject,
             topic=topic,
             difficulty=difficulty_enum,
-            created_by=str(current_user.id),
+            created_by=current_user.id_str,
         )
 
         # Create or update test series
@@ -131,13 +131,13 @@ async def import_questions_from_csv(
             subject=subject,
             duration_minutes=duration_minutes,
             is_free=is_free_bool,
-            created_by=str(current_user.id),
+            created_by=current_user.id_str,
             existing_test_id=existing_test_id,
         )
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE if not existing_test_id else ActionType.UPDATE,
             "test_series",
             str(test_series.id),
@@ -2,6 +2,8 @@
 Admin image management endpoints for questions
 """
 
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from typing import Optional, Dict, Any
 from bson import ObjectId
@@ -98,7 +100,7 @@ async def upload_question_image(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "questions",
             question_id,
@@ -167,50 +169,44 @@ async def delete_question_image(
                 detail=f"Invalid image_type. Must be one of: {', '.join(valid_types)}",
             )
 
-        # Get question
-        question = await Question.get(question_id)
-        if not question:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
-            )
-
-        # Remove image URL from question
-        image_removed = False
-        if image_type == "question":
-            if image_url in question.question_image_urls:
-                question.question_image_urls.remove(image_url)
-                image_removed = True
-        elif image_type == "explanation":
-            if image_url in question.explanation_image_urls:
-                question.explanation_image_urls.remove(image_url)
-                image_removed = True
-        elif image_type == "remarks":
-            if image_url in question.remarks_image_urls:
-                question.remarks_image_urls.remove(image_url)
-                image_removed = True
-        elif image_type == "option" and option_index is not None:
-            if (
-                option_index < len(question.options)
-                and image_url in question.options[option_index].image_urls
+        # Resolve the list holding the image
+        if image_type == "option":
+            if option_index is None or option_index < 0:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Image not found in question",
+                )
+            field = f"options.{option_index}.image_urls"
+        else:
+            field = f"{image_type}_image_urls"
+
+        # Remove image URL from question in place; matching on the URL keeps
+        # a missing image from touching the document
+        oid = ObjectId(question_id)
+        result = await Question.find_one({"_id": oid, field: image_url}).update(
+            {
+                "$pull": {field: image_url},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            }
+        )
+        if not result.matched_count:
+            if not await Question.get_pymongo_collection().count_documents(
+                {"_id": oid}, limit=1
             ):
-                question.options[option_index].image_urls.remove(image_url)
-                image_removed = True
-
-        if not image_removed:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Image not found in question",
             )
 
-        # Save updated question
-        await question.save()
-
         # Delete image from storage
         await FileUploadService.delete_question_image(image_url)
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "questions",
             question_id,
@@ -103,7 +103,7 @@ async def update_question(
     try:
         # Update question data
         question, changes = await QuestionService.update_question_data(
-            question_id, question_data.dict(exclude_unset=True)
+            question_id, question_data.model_dump(exclude_unset=True)
         )
 
         if not question:
@@ -120,7 +120,7 @@ async def update_question(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "questions",
             question_id,
@@ -170,7 +170,7 @@ async def delete_question(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.DELETE,
             "questions",
             question_id,
@@ -73,7 +73,7 @@ async def upload_section_pdf(
             file_url=file_url,
             file_size_kb=int(file.size / 1024) if file.size else 0,
             file_type="pdf",
-            uploaded_by=str(current_user.id),
+            uploaded_by=current_user.id_str,
             description=description.strip() if description else None,
         )
 
@@ -89,7 +89,7 @@ async def upload_section_pdf(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "section_files",
             section_file.id,
@@ -258,7 +258,7 @@ async def delete_section_file(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.DELETE,
             "section_files",
             file_id,
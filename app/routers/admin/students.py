@@ -64,7 +64,7 @@ async def list_students(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "users",
             "N/A",
@@ -151,7 +151,7 @@ async def get_student(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "users",
             student_id,
@@ -191,7 +191,7 @@ async def update_student(
     try:
         # Update student data
         student, changes = await StudentService.update_student_data(
-            student_id, update_data.dict(exclude_unset=True)
+            student_id, update_data.model_dump(exclude_unset=True)
         )
 
         if not student:
@@ -208,7 +208,7 @@ async def update_student(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "users",
             student_id,
@@ -284,7 +284,7 @@ async def deactivate_student(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.DELETE,
             "users",
             student_id,
@@ -353,7 +353,7 @@ async def permanently_delete_student(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.DELETE,
             "users",
             student_id,
@@ -400,7 +400,7 @@ async def reset_student_password(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "users",
             student_id,
@@ -451,7 +451,7 @@ async def get_student_analytics(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "user_analytics",
             student_id,
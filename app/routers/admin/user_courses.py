@@ -103,7 +103,7 @@ async def list_course_enrollments(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "course_enrollments",
             "N/A",
@@ -176,7 +176,7 @@ async def get_user_course_enrollments(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "course_enrollments",
             user_id,
@@ -250,7 +250,7 @@ async def get_course_enrollments(
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "course_enrollments",
             course_id,
@@ -22,15 +22,15 @@ async def get_user_analytics(current_user: User = Depends(get_current_user)):
     """Get current user's performance analytics"""
     try:
         # Get user analytics or create if not exists
-        analytics = await UserAnalytics.find_one({"user_id": str(current_user.id)})
+        analytics = await UserAnalytics.find_one({"user_id": current_user.id_str})
         if not analytics:
-            analytics = UserAnalytics(user_id=str(current_user.id))
+            analytics = UserAnalytics(user_id=current_user.id_str)
             await analytics.insert()
 
         # Get recent test attempts
         recent_attempts = (
             await TestAttempt.find(
-                {"user_id": str(current_user.id), "is_completed": True}
+                {"user_id": current_user.id_str, "is_completed": True}
             )
             .sort([("created_at", -1)])
             .limit(5)
@@ -87,7 +87,7 @@ async def get_user_analytics(current_user: User = Depends(get_current_user)):
         ]
 
         # Format study habits
-        study_habits = analytics.study_habits.dict() if analytics.study_habits else {}
+        study_habits = analytics.study_habits.model_dump() if analytics.study_habits else {}
 
         return {
             "message": "User analytics retrieved successfully",
@@ -130,7 +130,7 @@ async def get_test_analytics(
         user_attempts = (
             await TestAttempt.find(
                 {
-                    "user_id": str(current_user.id),
+                    "user_id": current_user.id_str,
                     "test_series_id": test_id,
                     "is_completed": True,
                 }
@@ -177,7 +177,7 @@ async def get_test_analytics(
             # Add section summaries if available
             if latest_attempt.section_summaries:
                 attempt_details["section_summaries"] = [
-                    section.dict() for section in latest_attempt.section_summaries
+                    section.model_dump() for section in latest_attempt.section_summaries
                 ]
 
         # Get performance trend over time
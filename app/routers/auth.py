@@ -10,23 +10,39 @@ from ..auth import (
     PasswordResetRequest,
     PasswordUpdateRequest,
     ResetPasswordWithOTPRequest,
+    EmailRequest,
+    EmailOTPRequest,
+    ProfileUpdateRequest,
 )
-from ..models.user import User
+from ..models.user import User, UserAuthStatus
+from ..models.enums import UserRole
 from ..models.user_session import UserSession
 from ..services.email_service import EmailService
 from ..services.otp_service import OTPService
 from ..services.session_service import SessionService
-from ..dependencies import get_current_user, security, ensure_db
+from ..dependencies import (
+    get_current_user,
+    security,
+    ensure_db,
+    limit_otp_send,
+    limit_otp_verify,
+)
+from ..rate_limiter import otp_send_limiter, otp_verify_limiter, client_ip
 from typing import Dict, Any
 from datetime import datetime, timezone
-from ..input_sanitizer import sanitizer
+import asyncio
 import logging
+import jwt
+from beanie import PydanticObjectId
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Authentication"])
 
+# Dashboard landing page per role, built once at import time
+_DASHBOARD_URLS = {role: f"/dashboard/{role.value}" for role in UserRole}
+
 
 @router.post(
     "/register",
@@ -48,18 +64,14 @@ async def register(user_data: UserRegisterRequest, background_tasks: BackgroundT
     Returns user information and success message.
     """
     try:
-        # Sanitize user input
-        sanitized_data = sanitizer.sanitize_dict(user_data.dict())
-
-        # Do not use background_tasks for OTP email
-        new_user = await AuthService.register_user(
-            UserRegisterRequest(**sanitized_data),
-            None
-        )
+        # Input is already sanitized by the request model's validators
+        new_user = await AuthService.register_user(user_data, None)
 
         user_response = AuthService.convert_user_to_response(new_user)
-        # Generate and send verification OTP synchronously
-        await AuthService.generate_and_send_otp(new_user.email, background_tasks=None, sync_send=True)
+        # Generate verification OTP; the email goes out after the response where possible
+        await AuthService.generate_and_send_otp(
+            new_user.email, background_tasks=background_tasks, sync_send=False
+        )
 
         return {
             "message": "User registered successfully",
@@ -100,13 +112,9 @@ async def login(
     Otherwise, returns access token, refresh token, and user information directly.
     """
     try:
-
-        # Sanitize login input
-        sanitized_data = sanitizer.sanitize_dict(request_data.dict())
-        login_data = UserLoginRequest(**sanitized_data)
-
+        # Input is already sanitized by the request model's validators
         user = await AuthService.authenticate_user(
-            login_data.email, login_data.password
+            request_data.email, request_data.password
         )
 
         if not user:
@@ -124,77 +132,64 @@ async def login(
                 detail="Account is deactivated. Please contact admin.",
             )
 
-        # Update last login
-        user.last_login = datetime.now(timezone.utc)
-        user.update_timestamp()
-        await user.save()
+        # Update last login (one clock read stamps both timestamps)
+        now = datetime.now(timezone.utc)
+        changes = {"last_login": now, "updated_at": now}
 
         # Check if login OTP verification is required
+        otp = None
         if settings.LOGIN_OTP_REQUIRED:
             # Generate OTP
             otp = OTPService.generate_otp()
-            expiry = OTPService.generate_otp_expiry()
+            changes["login_otp"] = otp
+            changes["login_otp_expires_at"] = OTPService.generate_otp_expiry()
+
+        # Persist last login and any login OTP with one targeted $set instead of
+        # re-serialising the whole document
+        await AuthService.update_user_fields(user, changes)
 
-            # Update user with login OTP
-            user.login_otp = otp
-            user.login_otp_expires_at = expiry
-            await user.save()
+        if otp is not None:
 
-            # Send OTP email synchronously (never use background_tasks)
+            # Send OTP email (after the response unless running serverless)
             logger.info(f"📧 Sending login OTP to {user.email}...")
-            email_sent = await EmailService.send_login_otp_email(user.email, otp)
+            email_sent = await EmailService.deliver(
+                background_tasks, EmailService.send_login_otp_email, user.email, otp
+            )
             if email_sent:
-                logger.info(f"✅ Login OTP email sent to {user.email}")
+                logger.info(f"✅ Login OTP email sent or queued for {user.email}")
             else:
                 logger.error(f"❌ Failed to send login OTP email to {user.email}")
 
             return LoginResponse(
                 message="Login requires verification",
                 requires_verification=True,
-                user=AuthService.convert_user_to_response(user).dict(),
+                user=AuthService.convert_user_to_response(user),
             )
 
         # If OTP is not required, return tokens directly
-        token = Token(
-            access_token=AuthService.create_access_token(data={"sub": user.email}),
-            refresh_token=AuthService.create_refresh_token(data={"sub": user.email}),
-            token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        )
+        token = AuthService.create_token_pair(user.email, user.role)
 
         # Create session for the new refresh token
-        try:
-            # Extract device info from request (if available)
-            user_agent = None
-            ip_address = None
-            if request:
-                user_agent = request.headers.get("user-agent")
-                ip_address = request.client.host if request.client else None
-
-            await SessionService.create_session(
-                user_id=str(user.id),
-                refresh_token=token.refresh_token,
-                user_agent=user_agent,
-                ip_address=ip_address,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to create session for user {user.email}: {str(e)}")
-            # Continue with login even if session creation fails
+        await SessionService.create_session_from_request(
+            user.id_str, token.refresh_token, request
+        )
 
         return LoginResponse(
             message="Login successful",
             requires_verification=False,
-            user=AuthService.convert_user_to_response(user).dict(),
+            user=AuthService.convert_user_to_response(user),
             tokens=token,
-            dashboard_url=f"/dashboard/{user.role.value}",
+            dashboard_url=_DASHBOARD_URLS[user.role],
         )
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.exception(f"Login error: {str(e)}")
-        # Log more details about the exception to help diagnose connection issues
-        print(f"Login error details - Type: {type(e).__name__}, Message: {str(e)}")
+        logger.error(
+            f"Login error: {str(e)}",
+            exc_info=True,
+            extra={"error_type": type(e).__name__},
+        )
 
         # More specific error message based on the exception type
         if "ConnectionFailure" in str(
@@ -215,6 +210,7 @@ async def login(
 @router.get(
     "/me",
     response_model=UserResponse,
+    response_model_exclude_none=True,
     summary="Get current user profile",
     description="Get the profile information of the currently authenticated user",
 )
@@ -246,21 +242,12 @@ async def refresh_access_token(
     3. Blacklists the old refresh token
     4. Creates new session record
     """
-    import jwt
-    from ..auth import SECRET_KEY, ALGORITHM
-
     try:
         # Extract device information from request
-        user_agent = None
-        ip_address = None
-        if request:
-            user_agent = request.headers.get("user-agent")
-            ip_address = request.client.host if request.client else None
+        user_agent, ip_address = SessionService.client_info(request)
 
         # Verify refresh token
-        payload = jwt.decode(
-            credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM]
-        )
+        payload = AuthService.decode_token(credentials.credentials)
         email: str = payload.get("sub")
         token_type: str = payload.get("type")
 
@@ -271,17 +258,23 @@ async def refresh_access_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Look up the user and the session concurrently
+        user, session = await asyncio.gather(
+            User.find_one({"email": email}, projection_model=UserAuthStatus),
+            # No activity touch: the session is rotated out below
+            SessionService.validate_session(
+                credentials.credentials, update_activity=False
+            ),
+        )
+
         # Check if user exists and is active
-        user = await User.find_one({"email": email})
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found or inactive",
             )
 
-        # Validate session and check for blacklisting
-        session = await SessionService.validate_session(credentials.credentials)
-
+        # Check the session was found and is not blacklisted
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -297,17 +290,13 @@ async def refresh_access_token(
                 "suspicious_refresh", "Refresh attempt on suspicious session"
             )
 
-        # Blacklist the old refresh token by deactivating the session
-        await SessionService.blacklist_refresh_token(credentials.credentials)
+        token = AuthService.create_token_pair(user.email, user.role)
 
-        # Create new tokens
-        access_token = AuthService.create_access_token(data={"sub": user.email})
-        refresh_token = AuthService.create_refresh_token(data={"sub": user.email})
-
-        # Create new session for the new refresh token
-        new_session = await SessionService.create_session(
-            user_id=str(user.id),
-            refresh_token=refresh_token,
+        # Blacklist the old refresh token and create the new session in one write
+        new_session = await SessionService.rotate_session(
+            old_session=session,
+            old_refresh_token=credentials.credentials,
+            new_refresh_token=token.refresh_token,
             user_agent=user_agent,
             ip_address=ip_address,
         )
@@ -316,9 +305,7 @@ async def refresh_access_token(
             f"✅ Token refreshed successfully for user {email}, new session: {new_session.id}"
         )
 
-        return Token(
-            access_token=access_token, refresh_token=refresh_token, token_type="bearer"
-        )
+        return token
 
     except jwt.PyJWTError:
         raise HTTPException(
@@ -341,31 +328,34 @@ async def refresh_access_token(
     response_model=Dict[str, str],
     summary="Send verification email",
     description="Send OTP verification email to user's email address",
+    dependencies=[Depends(limit_otp_send)],
 )
 async def send_verification_email(
-    request_data: dict,
+    request_data: EmailRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
 ):
     """Send verification email with OTP"""
     try:
-        email = request_data.get("email")
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Email is required"
-            )
+        email = request_data.email
+        response = {
+            "message": "Verification email sent successfully",
+            "note": "Check your email for the OTP code",
+        }
+
+        # Unknown addresses get the same answer without any OTP or SMTP work
+        if not await User.find_one({"email": email}, projection_model=UserAuthStatus):
+            return response
 
-        # Always send OTP synchronously (never use background_tasks)
-        success = await AuthService.generate_and_send_otp(email, background_tasks=None, sync_send=True)
+        success = await AuthService.generate_and_send_otp(
+            email, background_tasks=background_tasks, sync_send=False
+        )
         if success:
-            return {
-                "message": "Verification email sent successfully",
-                "note": "Check your email for the OTP code",
-            }
+            return response
         else:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to send verification email",
             )
 
     except HTTPException as e:
@@ -405,6 +395,10 @@ async def verify_login(
                 detail="Email and OTP are required",
             )
 
+        otp_verify_limiter.check(
+            f"ip:{client_ip(request)}", f"email:{str(email).lower()}"
+        )
+
         # Find user by email
         user = await User.find_one({"email": email})
         if not user:
@@ -413,51 +407,26 @@ async def verify_login(
                 detail="User not found",
             )
 
-        # Check if OTP matches and is not expired
-        if user.login_otp == otp and not OTPService.is_otp_expired(
-            user.login_otp_expires_at
-        ):
-            # Clear OTP
-            user.login_otp = None
-            user.login_otp_expires_at = None
-            await user.save()
-
+        # Check the OTP is unexpired, then that it matches
+        if OTPService.verify_otp(user.login_otp, user.login_otp_expires_at, otp):
             # Generate tokens
-            token = Token(
-                access_token=AuthService.create_access_token(data={"sub": user.email}),
-                refresh_token=AuthService.create_refresh_token(
-                    data={"sub": user.email}
+            token = AuthService.create_token_pair(user.email, user.role)
+
+            # Clear the OTP and open the session concurrently
+            await asyncio.gather(
+                AuthService.update_user_fields(
+                    user, {"login_otp": None, "login_otp_expires_at": None}
+                ),
+                SessionService.create_session_from_request(
+                    user.id_str, token.refresh_token, request
                 ),
-                token_type="bearer",
-                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
             )
 
-            # Create session for the new refresh token
-            try:
-                # Extract device info from request (if available)
-                user_agent = None
-                ip_address = None
-                if request:
-                    user_agent = request.headers.get("user-agent")
-                    ip_address = request.client.host if request.client else None
-
-                await SessionService.create_session(
-                    user_id=str(user.id),
-                    refresh_token=token.refresh_token,
-                    user_agent=user_agent,
-                    ip_address=ip_address,
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Failed to create session for user {user.email}: {str(e)}"
-                )
-                # Continue with login even if session creation fails
-
             return {
                 "message": "Login verification successful",
                 "user": AuthService.convert_user_to_response(user),
                 "tokens": token,
-                "dashboard_url": f"/dashboard/{user.role.value}",
+                "dashboard_url": _DASHBOARD_URLS[user.role],
             }
         else:
             raise HTTPException(
@@ -479,35 +448,32 @@ async def verify_login(
     response_model=Dict[str, Any],
     summary="Verify email with OTP (for logged-in users)",
     description="Verify email address using OTP code for logged-in users",
+    dependencies=[Depends(limit_otp_verify)],
 )
 async def verify_email(
-    request_data: dict,  # {"email": "user@example.com", "otp": "123456"}
+    request_data: EmailOTPRequest,
     current_user: User = Depends(get_current_user),
 ):
     """Verify email with OTP for logged-in users"""
     try:
-        email = request_data.get("email")
-        otp = request_data.get("otp")
+        otp = request_data.otp
 
-        if not email or not otp:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email and OTP are required",
-            )
-
-        # Check if OTP matches and is not expired
-        if (
-            current_user.email_verification_otp == otp
-            and not OTPService.is_otp_expired(
-                current_user.email_verification_otp_expires_at
-            )
+        # Check the OTP is unexpired, then that it matches
+        if OTPService.verify_otp(
+            current_user.email_verification_otp,
+            current_user.email_verification_otp_expires_at,
+            otp,
         ):
-
             # Mark email as verified and clear OTP
-            current_user.is_email_verified = True
-            current_user.email_verification_otp = None
-            current_user.email_verification_otp_expires_at = None
-            await current_user.save()
+            await AuthService.update_user_fields(
+                current_user,
+                {
+                    "is_email_verified": True,
+                    "email_verification_otp": None,
+                    "email_verification_otp_expires_at": None,
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
 
             return {
                 "message": "Email verified successfully",
@@ -559,54 +525,27 @@ async def verify_registration_email(
                 detail="Email and OTP are required",
             )
 
-        # Use the AuthService to verify the OTP
-        success = await AuthService.verify_email_otp(email, otp)
+        otp_verify_limiter.check(
+            f"ip:{client_ip(request)}", f"email:{str(email).lower()}"
+        )
 
-        if success:
-            # Get the updated user to return in response
-            user = await User.find_one({"email": email})
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found",
-                )
+        # Use the AuthService to verify the OTP; it hands back the updated user
+        user = await AuthService.verify_email_otp(email, otp)
 
+        if user:
             # Generate tokens to allow immediate login after verification
-            token = Token(
-                access_token=AuthService.create_access_token(data={"sub": user.email}),
-                refresh_token=AuthService.create_refresh_token(
-                    data={"sub": user.email}
-                ),
-                token_type="bearer",
-                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            )
+            token = AuthService.create_token_pair(user.email, user.role)
 
             # Create session for the new refresh token
-            try:
-                # Extract device info from request (if available)
-                user_agent = None
-                ip_address = None
-                if request:
-                    user_agent = request.headers.get("user-agent")
-                    ip_address = request.client.host if request.client else None
-
-                await SessionService.create_session(
-                    user_id=str(user.id),
-                    refresh_token=token.refresh_token,
-                    user_agent=user_agent,
-                    ip_address=ip_address,
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Failed to create session for user {user.email}: {str(e)}"
-                )
-                # Continue with verification even if session creation fails
+            await SessionService.create_session_from_request(
+                user.id_str, token.refresh_token, request
+            )
 
             return {
                 "message": "Email verified successfully",
                 "user": AuthService.convert_user_to_response(user),
                 "tokens": token,
-                "dashboard_url": f"/dashboard/{user.role.value}",
+                "dashboard_url": _DASHBOARD_URLS[user.role],
             }
         else:
             raise HTTPException(
@@ -634,6 +573,7 @@ async def verify_registration_email(
 async def resend_verification_email(
     request_data: dict,
     background_tasks: BackgroundTasks,
+    request: Request,
 ):
     """
     Resend OTP to user's email for verification.
@@ -645,16 +585,28 @@ async def resend_verification_email(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Email is required"
             )
 
-        # Always send OTP synchronously (never use background_tasks)
-        success = await AuthService.generate_and_send_otp(email, background_tasks=None, sync_send=True)
+        otp_send_limiter.check(
+            f"ip:{client_ip(request)}", f"email:{str(email).lower()}"
+        )
+
+        response = {
+            "message": "Verification email resent successfully",
+            "note": "Check your email for the OTP code",
+        }
+
+        # Unknown addresses get the same answer without any OTP or SMTP work
+        if not await User.find_one({"email": email}, projection_model=UserAuthStatus):
+            return response
+
+        success = await AuthService.generate_and_send_otp(
+            email, background_tasks=background_tasks, sync_send=False
+        )
         if success:
-            return {
-                "message": "Verification email resent successfully",
-                "note": "Check your email for the OTP code",
-            }
+            return response
         else:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to resend verification email",
             )
 
     except HTTPException as e:
@@ -672,11 +624,12 @@ async def resend_verification_email(
 @router.put(
     "/profile",
     response_model=UserResponse,
+    response_model_exclude_none=True,
     summary="Update user profile",
     description="Update current user's profile information",
 )
 async def update_profile(
-    update_data: dict, current_user: User = Depends(get_current_user)
+    update_data: ProfileUpdateRequest, current_user: User = Depends(get_current_user)
 ):
     """
     Update user profile information.
@@ -684,10 +637,8 @@ async def update_profile(
     Allowed fields: name, phone, preferred_exam_categories
     """
     try:
-        # Sanitize update data
-        sanitized_data = sanitizer.sanitize_dict(update_data)
-        allowed_fields = {"name", "phone", "preferred_exam_categories"}
-        update_fields = {k: v for k, v in sanitized_data.items() if k in allowed_fields}
+        # Fields are sanitized by ProfileUpdateRequest's validators
+        update_fields = update_data.model_dump(mode="json", exclude_none=True)
 
         if not update_fields:
             raise HTTPException(
@@ -713,12 +664,9 @@ async def update_profile(
                     detail="Phone number already exists",
                 )
 
-        # Update user
-        for field, value in update_fields.items():
-            setattr(current_user, field, value)
-
-        current_user.update_timestamp()
-        await current_user.save()
+        # Update only the changed fields
+        update_fields["updated_at"] = datetime.now(timezone.utc)
+        await AuthService.update_user_fields(current_user, update_fields)
 
         return AuthService.convert_user_to_response(current_user)
 
@@ -748,7 +696,7 @@ async def change_password(
     """
     try:
         # Verify current password
-        if not AuthService.verify_password(
+        if not await AuthService.averify_password(
             password_data.current_password, current_user.password_hash
         ):
             raise HTTPException(
@@ -764,11 +712,13 @@ async def change_password(
             )
 
         # Update password
-        current_user.password_hash = AuthService.get_password_hash(
+        password_hash = await AuthService.aget_password_hash(
             password_data.new_password
         )
-        current_user.update_timestamp()
-        await current_user.save()
+        await AuthService.update_user_fields(
+            current_user,
+            {"password_hash": password_hash, "updated_at": datetime.now(timezone.utc)},
+        )
 
         return {"message": "Password updated successfully"}
 
@@ -797,10 +747,11 @@ async def logout(current_user: User = Depends(get_current_user)):
     4. Returns confirmation
     """
     try:
-        user_id = str(current_user.id)
+        user_id = current_user.id_str
 
         # Invalidate all user sessions
         invalidated_count = await SessionService.invalidate_all_user_sessions(user_id)
+        AuthService.invalidate_cached_user(current_user.email)
 
         logger.info(
             f"🚪 User {current_user.email} logged out, invalidated {invalidated_count} sessions"
@@ -830,30 +781,44 @@ async def logout(current_user: User = Depends(get_current_user)):
 async def forgot_password(
     request_data: PasswordResetRequest,
     background_tasks: BackgroundTasks,
+    request: Request,
 ):
     """
     Request a password reset by sending an OTP to the user's registered email.
 
     - **email**: Email address of the account to reset password for
     """
+    # Checked before the try block, which deliberately swallows every error
+    otp_send_limiter.check(
+        f"ip:{client_ip(request)}", f"email:{request_data.email.lower()}"
+    )
     try:
-        user = await User.find_one({"email": request_data.email})
-
-        if user:
-            # Generate OTP
-            otp = OTPService.generate_otp()
-            expiry = OTPService.generate_otp_expiry()
-
-            # Update user with reset password OTP
-            user.reset_password_otp = otp
-            user.reset_password_otp_expires_at = expiry
-            await user.save()
+        # Generate OTP
+        otp = OTPService.generate_otp()
+        expiry = OTPService.generate_otp_expiry()
+
+        # Store the reset OTP in one targeted write; matched_count doubles as the
+        # existence check so the full user document is never loaded
+        result = await User.find_one({"email": request_data.email}).update(
+            {
+                "$set": {
+                    "reset_password_otp": otp,
+                    "reset_password_otp_expires_at": expiry,
+                }
+            }
+        )
 
-            # ✅ Send email SYNCHRONOUSLY (await) - Don't rely on BackgroundTasks
+        if result.matched_count:
+            # Send after the response unless running serverless
             logger.info(f"📧 Sending password reset OTP to {request_data.email}...")
-            email_sent = await EmailService.send_password_reset_email(request_data.email, otp)
+            email_sent = await EmailService.deliver(
+                background_tasks,
+                EmailService.send_password_reset_email,
+                request_data.email,
+                otp,
+            )
             if email_sent:
-                logger.info(f"✅ Password reset email sent to {request_data.email}")
+                logger.info(f"✅ Password reset email sent or queued for {request_data.email}")
             else:
                 logger.error(f"❌ Failed to send password reset email to {request_data.email}")
 
@@ -865,7 +830,7 @@ async def forgot_password(
 
     except Exception as e:
         # Log the error but don't reveal specifics in the response
-        print(f"Password reset request failed: {str(e)}")
+        logger.error(f"Password reset request failed: {str(e)}", exc_info=True)
         return {
             "message": "If the email exists, a password reset code has been sent",
             "detail": "Please check your email for the reset code",
@@ -878,7 +843,9 @@ async def forgot_password(
     summary="Reset password with OTP",
     description="Reset password using OTP sent to email",
 )
-async def reset_password_with_otp(reset_data: ResetPasswordWithOTPRequest):
+async def reset_password_with_otp(
+    reset_data: ResetPasswordWithOTPRequest, request: Request
+):
     """
     Reset password using OTP sent to email.
 
@@ -886,6 +853,9 @@ async def reset_password_with_otp(reset_data: ResetPasswordWithOTPRequest):
     - **otp**: The OTP code received via email
     - **new_password**: New password to set
     """
+    otp_verify_limiter.check(
+        f"ip:{client_ip(request)}", f"email:{reset_data.email.lower()}"
+    )
     try:
         # Find user by email
         user = await User.find_one({"email": reset_data.email})
@@ -895,11 +865,12 @@ async def reset_password_with_otp(reset_data: ResetPasswordWithOTPRequest):
                 detail="Invalid or expired reset code",
             )
 
-        # Check if OTP matches and is not expired
-        if user.reset_password_otp == reset_data.otp and not OTPService.is_otp_expired(
-            user.reset_password_otp_expires_at
+        # Check the OTP is unexpired, then that it matches
+        if OTPService.verify_otp(
+            user.reset_password_otp,
+            user.reset_password_otp_expires_at,
+            reset_data.otp,
         ):
-
             # Validate new password
             if not AuthService.validate_password(reset_data.new_password):
                 raise HTTPException(
@@ -907,12 +878,23 @@ async def reset_password_with_otp(reset_data: ResetPasswordWithOTPRequest):
                     detail="Password must be at least 8 characters long and contain uppercase, lowercase, number, and special character",
                 )
 
-            # Update password and clear OTP
-            user.password_hash = AuthService.get_password_hash(reset_data.new_password)
-            user.reset_password_otp = None
-            user.reset_password_otp_expires_at = None
-            user.update_timestamp()
-            await user.save()
+            # Update password and clear OTP in one partial write
+            password_hash = await AuthService.aget_password_hash(
+                reset_data.new_password
+            )
+            await User.find_one({"_id": user.id}).update(
+                {
+                    "$set": {
+                        "password_hash": password_hash,
+                        "updated_at": datetime.now(timezone.utc),
+                    },
+                    "$unset": {
+                        "reset_password_otp": "",
+                        "reset_password_otp_expires_at": "",
+                    },
+                }
+            )
+            AuthService.invalidate_cached_user(user.email)
 
             return {
                 "message": "Password reset successful",
@@ -945,24 +927,14 @@ async def get_user_sessions(current_user: User = Depends(get_current_user)):
 
     Returns session information including device details and activity.
     """
-    try:
-        sessions = await SessionService.get_user_sessions(str(current_user.id))
-        session_data = [session.to_dict() for session in sessions]
+    sessions = await SessionService.get_user_session_views(current_user.id_str)
+    session_data = [session.to_dict() for session in sessions]
 
-        return {
-            "message": "Sessions retrieved successfully",
-            "sessions": session_data,
-            "total_active": len(session_data),
-        }
-
-    except Exception as e:
-        logger.error(
-            f"Failed to retrieve sessions for user {current_user.email}: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve sessions: {str(e)}",
-        )
+    return {
+        "message": "Sessions retrieved successfully",
+        "sessions": session_data,
+        "total_active": len(session_data),
+    }
 
 
 @router.post(
@@ -980,24 +952,34 @@ async def invalidate_session(
     This will blacklist the refresh token for that session.
     """
     try:
-        # Find the session
-        session = await UserSession.get(session_id)
-
-        if not session:
+        if not PydanticObjectId.is_valid(session_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
             )
+        oid = PydanticObjectId(session_id)
 
-        # Verify ownership
-        if session.user_id != str(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only invalidate your own sessions",
+        # Ownership and state are part of the filter, so the common case is
+        # a single round trip
+        modified = await UserSession.deactivate_owned_session(
+            oid, current_user.id_str
+        )
+
+        if not modified:
+            # Work out why nothing matched: missing, foreign, or already inactive
+            session = await UserSession.get_pymongo_collection().find_one(
+                {"_id": oid}, {"user_id": 1}
             )
+            if not session:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+                )
+            if session.get("user_id") != current_user.id_str:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You can only invalidate your own sessions",
+                )
 
-        # Invalidate the session
-        session.deactivate()
-        await session.save()
+        AuthService.invalidate_cached_user(current_user.email)
 
         logger.info(f"🔒 Session {session_id} invalidated by user {current_user.email}")
 
@@ -1019,7 +1001,7 @@ async def invalidate_session(
 
 @router.post(
     "/logout-all",
-    response_model=Dict[str, str],
+    response_model=Dict[str, Any],
     summary="Logout from all devices",
     description="Invalidate all sessions across all devices for the current user",
 )
@@ -1030,26 +1012,17 @@ async def logout_all_devices(current_user: User = Depends(get_current_user)):
     This is useful for security purposes or when user wants to ensure
     no other sessions remain active.
     """
-    try:
-        user_id = str(current_user.id)
-        invalidated_count = await SessionService.invalidate_all_user_sessions(user_id)
-
-        logger.info(
-            f"🚪🔥 All sessions invalidated for user {current_user.email} ({invalidated_count} sessions)"
-        )
-
-        return {
-            "message": "Logged out from all devices successfully",
-            "detail": f"Invalidated {invalidated_count} sessions across all devices",
-            "sessions_invalidated": invalidated_count,
-            "instruction": "All tokens are now invalid across all devices and browsers",
-        }
-
-    except Exception as e:
-        logger.error(
-            f"Failed to logout all devices for user {current_user.email}: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to logout all devices: {str(e)}",
-        )
+    user_id = current_user.id_str
+    invalidated_count = await SessionService.invalidate_all_user_sessions(user_id)
+    AuthService.invalidate_cached_user(current_user.email)
+
+    logger.info(
+        f"🚪🔥 All sessions invalidated for user {current_user.email} ({invalidated_count} sessions)"
+    )
+
+    return {
+        "message": "Logged out from all devices successfully",
+        "detail": f"Invalidated {invalidated_count} sessions across all devices",
+        "sessions_invalidated": invalidated_count,
+        "instruction": "All tokens are now invalid across all devices and browsers",
+    }
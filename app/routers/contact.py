@@ -1,13 +1,69 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
 
-from ..models.contact import Contact
+from ..models.contact import Contact, ContactListView
 from ..dependencies import ensure_db
 
 router = APIRouter(prefix="/api/v1", tags=["contact"])
 
+# Contacts submitted within this window are written with one insert_many
+_BATCH_WINDOW_SECONDS = 0.01
+_pending_contacts: List[Tuple[Contact, asyncio.Future]] = []
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_contacts_after(delay: float) -> None:
+    """Wait out the batching window, then insert everything queued in it"""
+    global _flush_task
+    await asyncio.sleep(delay)
+
+    batch = _pending_contacts[:]
+    _pending_contacts.clear()
+    _flush_task = None
+
+    failed = {}
+    try:
+        await Contact.insert_many([contact for contact, _ in batch], ordered=False)
+    except BulkWriteError as e:
+        # Unordered: every document not listed in writeErrors was stored, so
+        # only those submitters see the failure
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = e
+    except Exception as e:
+        failed = {index: e for index in range(len(batch))}
+
+    for index, (_, future) in enumerate(batch):
+        if future.done():
+            continue
+        if index in failed:
+            future.set_exception(failed[index])
+        else:
+            future.set_result(None)
+
+
+async def _insert_batched(contact: Contact) -> None:
+    """Queue a contact for the next batched insert and wait until it is written"""
+    global _flush_task
+    loop = asyncio.get_running_loop()
+    if _flush_task is not None and _flush_task.get_loop() is not loop:
+        # Queued on a loop that is gone (e.g. a frozen serverless instance
+        # resumed on a new one); its flush will never run here
+        _pending_contacts.clear()
+        _flush_task = None
+
+    # Assign the id up front so the caller can report it once the batch lands
+    contact.id = PydanticObjectId()
+    future = loop.create_future()
+    _pending_contacts.append((contact, future))
+    if _flush_task is None:
+        _flush_task = asyncio.create_task(_flush_contacts_after(_BATCH_WINDOW_SECONDS))
+    await future
+
 
 class ContactForm(BaseModel):
     name: str
@@ -19,67 +75,83 @@ class ContactForm(BaseModel):
 @router.post("/contact", status_code=status.HTTP_201_CREATED)
 async def submit_contact_form(contact_data: ContactForm):
     """Submit a contact form and store it in the database"""
-    try:
-        # Ensure database is available
-        await ensure_db()
-
-        # Create new contact entry
-        contact = Contact(
-            name=contact_data.name,
-            email=contact_data.email,
-            phone=contact_data.phone,
-            message=contact_data.message,
-        )
-
-        # Save to database
-        await contact.insert()
-
-        return {
-            "message": "Contact form submitted successfully",
-            "contact_id": str(contact.id),
-            "submitted_at": contact.created_at,
-        }
+    # Ensure database is available
+    await ensure_db()
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to submit contact form: {str(e)}",
-        )
+    # Create new contact entry
+    contact = Contact(
+        name=contact_data.name,
+        email=contact_data.email,
+        phone=contact_data.phone,
+        message=contact_data.message,
+    )
 
+    # Save to database, coalesced with other submissions in the same window
+    await _insert_batched(contact)
 
-@router.get("/contact")
-async def get_contact_submissions(skip: int = 0, limit: int = 50):
-    """Get all contact form submissions (for admin use)"""
-    try:
-        # Ensure database is available
-        await ensure_db()
-
-        # Get contacts with pagination
-        contacts = await Contact.find().skip(skip).limit(limit).to_list()
-
-        # Convert to response format
-        contact_list = []
-        for contact in contacts:
-            contact_list.append(
-                {
-                    "id": str(contact.id),
-                    "name": contact.name,
-                    "email": contact.email,
-                    "phone": contact.phone,
-                    "message": contact.message,
-                    "created_at": contact.created_at,
-                    "updated_at": contact.updated_at,
-                }
-            )
+    return {
+        "message": "Contact form submitted successfully",
+        "contact_id": str(contact.id),
+        "submitted_at": contact.created_at,
+    }
 
-        return {
-            "message": "Contact submissions retrieved successfully",
-            "contacts": contact_list,
-            "pagination": {"skip": skip, "limit": limit, "total": len(contact_list)},
-        }
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve contact submissions: {str(e)}",
-        )
+@router.get("/contact")
+async def get_contact_submissions(
+    skip: int = 0, limit: int = 50, after: Optional[str] = None
+):
+    """
+    Get contact form submissions, newest first (for admin use).
+
+    Pass the previous page's `next_cursor` as `after` to page without the
+    server-side cost of a growing `skip`.
+    """
+    # Ensure database is available
+    await ensure_db()
+
+    query = {}
+    if after:
+        if not PydanticObjectId.is_valid(after):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+        query = {"_id": {"$lt": PydanticObjectId(after)}}
+        skip = 0
+
+    # Get contacts with pagination, projected to the listed fields
+    page = (
+        Contact.find(query, projection_model=ContactListView)
+        .sort([("_id", -1)])
+        .skip(skip)
+        .limit(limit)
+        .to_list()
+    )
+    contacts, total = await asyncio.gather(
+        page, Contact.get_pymongo_collection().estimated_document_count()
+    )
+
+    # Convert to response format
+    contact_list = [contact.model_dump(mode="json") for contact in contacts]
+    next_cursor = contact_list[-1]["id"] if len(contact_list) == limit else None
+
+    return {
+        "message": "Contact submissions retrieved successfully",
+        "contacts": contact_list,
+        "pagination": {
+            "skip": skip,
+            "limit": limit,
+            "total": total,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+@router.get("/contact/count")
+async def get_contact_count():
+    """Approximate number of contact submissions, read from collection metadata"""
+    # Ensure database is available
+    await ensure_db()
+
+    total = await Contact.get_pymongo_collection().estimated_document_count()
+    return {"total": total}
@@ -2,18 +2,20 @@
 Course CRUD operations router
 """
 
+from beanie import PydanticObjectId
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import Optional, Dict, Any
 
 from ...models.course import Course
 from ...models.user import User
-from ...models.enums import ExamCategory, UserRole
+from ...models.enums import ExamCategory
 from ...dependencies import (
     admin_required,
     get_current_user,
-    get_current_user_optional,
+    is_admin_request,
 )
 from ...services.course_service import CourseService
+from ...utils import json_response
 from .schemas import (
     CourseCreateRequest,
     CourseUpdateRequest,
@@ -41,7 +43,7 @@ async def create_course(
 ):
     """Create a new course (Admin only)"""
     try:
-        result = await CourseService.create_course(course_data.dict(), current_user)
+        result = await CourseService.create_course(course_data.model_dump(), current_user)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -66,22 +68,39 @@ async def list_courses(
         None, description="Filter by exam category"
     ),
     search: Optional[str] = Query(None, description="Search in title and description"),
+    fuzzy: bool = Query(
+        False, description="Match search as a substring instead of whole words"
+    ),
     section: Optional[str] = Query(None, description="Filter by section"),
     is_free: Optional[bool] = Query(None, description="Filter by free courses"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    sort_by: str = Query("priority_order", description="Field to sort by"),
+    sort_by: str = Query(
+        "priority_order",
+        description="Field to sort by; 'relevance' ranks search matches",
+    ),
     sort_order: str = Query("asc", description="Sort order (asc or desc)"),
-    page: int = Query(1, description="Page number", ge=1),
+    page: int = Query(
+        1,
+        description="Page number (deprecated: use `after` instead)",
+        ge=1,
+        deprecated=True,
+    ),
     limit: int = Query(10, description="Items per page", ge=1, le=1000),
+    after: Optional[str] = Query(
+        None, description="Cursor from the previous page's `next_cursor`"
+    ),
     show_all: bool = Query(
         False, description="Admin only: include inactive courses in the results"
     ),
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    include_total: bool = Query(
+        False, description="Also return total and total_pages (runs a count query)"
+    ),
+    is_admin: bool = Depends(is_admin_request),
 ):
     """List all courses with filters and pagination"""
     try:
         if show_all:
-            if current_user is None or current_user.role != UserRole.ADMIN:
+            if not is_admin:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Admin access required to view all courses",
@@ -100,9 +119,19 @@ async def list_courses(
             sort_order=sort_order,
             page=page,
             limit=limit,
-            current_user=current_user,
+            is_admin=is_admin,
+            include_total=include_total,
+            after=after,
+            fuzzy=fuzzy,
+        )
+        return json_response(result)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-        return result
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -120,7 +149,7 @@ async def get_enrolled_courses(current_user: User = Depends(get_current_user)):
     """Get courses the current user is enrolled in"""
     try:
         result = await CourseService.get_enrolled_courses(current_user)
-        return result
+        return json_response(result)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -179,14 +208,14 @@ async def get_course(course_id: str):
     description="Admin endpoint to update course details",
 )
 async def update_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     course_data: CourseUpdateRequest,
     current_user: User = Depends(admin_required),
 ):
     """Update course details (Admin only)"""
     try:
         result = await CourseService.update_course(
-            course_id, course_data.dict(exclude_unset=True), current_user
+            str(course_id), course_data.model_dump(exclude_unset=True), current_user
         )
         return result
     except ValueError as e:
@@ -207,10 +236,12 @@ async def update_course(
     summary="Delete course",
     description="Admin endpoint to delete (deactivate) a course",
 )
-async def delete_course(course_id: str, current_user: User = Depends(admin_required)):
+async def delete_course(
+    course_id: PydanticObjectId, current_user: User = Depends(admin_required)
+):
     """Delete (deactivate) a course (Admin only)"""
     try:
-        result = await CourseService.delete_course(course_id, current_user)
+        result = await CourseService.delete_course(str(course_id), current_user)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -231,12 +262,14 @@ async def delete_course(course_id: str, current_user: User = Depends(admin_requi
     description="Student endpoint to enroll in a course",
 )
 async def enroll_in_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     current_user: User = Depends(get_current_user),
 ):
     """Enroll in a course (Student only)"""
     try:
-        result = await CourseService.enroll_user_in_course(course_id, current_user)
+        result = await CourseService.enroll_user_in_course(
+            str(course_id), current_user
+        )
         return result
     except ValueError as e:
         raise HTTPException(
@@ -257,7 +290,7 @@ async def enroll_in_course(
     description="Admin endpoint to toggle course visibility (is_active)",
 )
 async def toggle_course_visibility(
-    course_id: str,
+    course_id: PydanticObjectId,
     current_user: User = Depends(admin_required),
 ):
     """Toggle course visibility (Admin only)"""
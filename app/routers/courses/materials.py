@@ -2,18 +2,46 @@
 Course materials router - focused on material and test series management within courses
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from datetime import datetime, timezone
+
+from beanie import PydanticObjectId
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
 from typing import Dict, Any
 
 from ...models.user import User
 from ...models.course import Course
 from ...models.admin_action import AdminAction, ActionType
 from ...dependencies import admin_required
+from ...services import course_cache
 from ...services.admin_service import AdminService
 
 router = APIRouter(prefix="/api/v1/courses", tags=["Courses - Materials"])
 
 
+async def _update_course(
+    oid: PydanticObjectId, condition: Dict[str, Any], update: Dict[str, Any]
+) -> bool:
+    """
+    Atomically apply `update` to a course matching `condition`.
+
+    Returns False if the course exists but does not match `condition` (the
+    change was already made); raises 404 if the course does not exist.
+    """
+    update["$set"] = {"updated_at": datetime.now(timezone.utc)}
+    result = await Course.find_one({"_id": oid, **condition}).update(update)
+    if not result.matched_count:
+        if not await Course.get_pymongo_collection().count_documents(
+            {"_id": oid}, limit=1
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
+        return False
+    course_cache.invalidate()
+    return True
+
+
 @router.post(
     "/{course_id}/materials",
     response_model=Dict[str, Any],
@@ -21,19 +49,12 @@ router = APIRouter(prefix="/api/v1/courses", tags=["Courses - Materials"])
     description="Admin endpoint to add study material to a course",
 )
 async def add_material_to_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     data: Dict[str, Any],
     current_user: User = Depends(admin_required),
 ):
     """Add study material to a course (Admin only)"""
     try:
-        course = await Course.get(course_id)
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found",
-            )
-
         material_id = data.get("material_id")
         if not material_id:
             raise HTTPException(
@@ -41,31 +62,31 @@ async def add_material_to_course(
                 detail="Material ID is required",
             )
 
-        # Check if material ID already exists in the course
-        if material_id in course.material_ids:
+        # Add material to course unless it is already there
+        added = await _update_course(
+            course_id,
+            {"material_ids": {"$ne": material_id}},
+            {"$addToSet": {"material_ids": material_id}},
+        )
+        if not added:
             return {
                 "message": "Material already added to this course",
-                "course_id": course_id,
+                "course_id": str(course_id),
                 "material_id": material_id,
             }
 
-        # Add material to course
-        course.material_ids.append(material_id)
-        course.update_timestamp()
-        await course.save()
-
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "courses",
-            course_id,
+            str(course_id),
             {"action": "material_added", "material_id": material_id},
         )
 
         return {
             "message": "Material added to course successfully",
-            "course_id": course_id,
+            "course_id": str(course_id),
             "material_id": material_id,
         }
 
@@ -85,19 +106,12 @@ async def add_material_to_course(
     description="Admin endpoint to add test series to a course",
 )
 async def add_test_series_to_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     data: Dict[str, Any],
     current_user: User = Depends(admin_required),
 ):
     """Add test series to a course (Admin only)"""
     try:
-        course = await Course.get(course_id)
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found",
-            )
-
         test_series_id = data.get("test_series_id")
         if not test_series_id:
             raise HTTPException(
@@ -105,31 +119,31 @@ async def add_test_series_to_course(
                 detail="Test series ID is required",
             )
 
-        # Check if test series ID already exists in the course
-        if test_series_id in course.test_series_ids:
+        # Add test series to course unless it is already there
+        added = await _update_course(
+            course_id,
+            {"test_series_ids": {"$ne": test_series_id}},
+            {"$addToSet": {"test_series_ids": test_series_id}},
+        )
+        if not added:
             return {
                 "message": "Test series already added to this course",
-                "course_id": course_id,
+                "course_id": str(course_id),
                 "test_series_id": test_series_id,
             }
 
-        # Add test series to course
-        course.test_series_ids.append(test_series_id)
-        course.update_timestamp()
-        await course.save()
-
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "courses",
-            course_id,
+            str(course_id),
             {"action": "test_series_added", "test_series_id": test_series_id},
         )
 
         return {
             "message": "Test series added to course successfully",
-            "course_id": course_id,
+            "course_id": str(course_id),
             "test_series_id": test_series_id,
         }
 
@@ -149,44 +163,37 @@ async def add_test_series_to_course(
     description="Admin endpoint to remove study material from a course",
 )
 async def remove_material_from_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     material_id: str,
     current_user: User = Depends(admin_required),
 ):
     """Remove study material from a course (Admin only)"""
     try:
-        course = await Course.get(course_id)
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found",
-            )
-
-        # Check if material exists in course
-        if material_id not in course.material_ids:
+        # Remove material from course
+        removed = await _update_course(
+            course_id,
+            {"material_ids": material_id},
+            {"$pull": {"material_ids": material_id}},
+        )
+        if not removed:
             return {
                 "message": "Material not found in this course",
-                "course_id": course_id,
+                "course_id": str(course_id),
                 "material_id": material_id,
             }
 
-        # Remove material from course
-        course.material_ids.remove(material_id)
-        course.update_timestamp()
-        await course.save()
-
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "courses",
-            course_id,
+            str(course_id),
             {"action": "material_removed", "material_id": material_id},
         )
 
         return {
             "message": "Material removed from course successfully",
-            "course_id": course_id,
+            "course_id": str(course_id),
             "material_id": material_id,
         }
 
@@ -206,40 +213,28 @@ async def remove_material_from_course(
     description="Admin endpoint to remove a test series from a course",
 )
 async def remove_test_series_from_course(
-    course_id: str,
+    course_id: PydanticObjectId,
     test_series_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(admin_required),
 ):
     """Remove test series from a course (Admin only)"""
     try:
-        from bson import ObjectId
-
-        # Validate course_id format
-        if not ObjectId.is_valid(course_id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid course ID format",
-            )
-
-        # Find the course
-        course = await Course.get(course_id)
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
-            )
-
         # Remove test series ID if it exists
-        if test_series_id in course.test_series_ids:
-            course.test_series_ids.remove(test_series_id)
-            await course.save()
+        await _update_course(
+            course_id,
+            {"test_series_ids": test_series_id},
+            {"$pull": {"test_series_ids": test_series_id}},
+        )
 
-        # Log admin action
+        # Log admin action once the response is on its way
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "courses",
-            course_id,
+            str(course_id),
             {"action": "test_series_removed", "test_series_id": test_series_id},
+            background_tasks,
         )
 
         return {"status": "success", "message": "Test series removed from course"}
@@ -27,7 +27,7 @@ async def get_mock_history(
         # Get user's test attempts
         attempts = (
             await TestAttempt.find(
-                {"user_id": str(current_user.id), "is_completed": True}
+                {"user_id": current_user.id_str, "is_completed": True}
             )
             .sort([("end_time", -1)])
             .skip(skip)
@@ -74,7 +74,7 @@ async def get_mock_history(
 
         # Get total count
         total_count = await TestAttempt.find(
-            {"user_id": str(current_user.id), "is_completed": True}
+            {"user_id": current_user.id_str, "is_completed": True}
         ).count()
 
         return {
@@ -106,7 +106,7 @@ async def get_mock_attempt_details(
         attempt = await TestAttempt.get(attempt_id)
 
         # Check if attempt exists and belongs to current user
-        if not attempt or attempt.user_id != str(current_user.id):
+        if not attempt or attempt.user_id != current_user.id_str:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Test attempt not found",
@@ -224,7 +224,7 @@ async def get_mock_attempt_details(
             "time_spent_seconds": attempt.time_spent_seconds,
             "course": course_info,
             "section_summaries": [
-                section.dict() for section in attempt.section_summaries
+                section.model_dump() for section in attempt.section_summaries
             ],
             "question_attempts": question_attempts_with_details,
         }
@@ -44,7 +44,7 @@ async def submit_course_mock(
     try:
         result = await MockTestService.submit_course_mock(
             course_id=course_id,
-            answers=[answer.dict() for answer in payload.answers],
+            answers=[answer.model_dump() for answer in payload.answers],
             time_spent_seconds=payload.time_spent_seconds or 0,
             current_user=current_user,
         )
@@ -2,13 +2,16 @@
 Course sections router - focused on section management within courses
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query, Path
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status, Query, Path
 from typing import Optional, Dict, Any
 
 from ...models.user import User
 from ...dependencies import admin_required, get_current_user
 from ...services.section_service import SectionService
-from ...services.course_question_service import CourseQuestionService
+from ...services.course_question_service import CourseQuestionService, MAX_CSV_SIZE
+from ...utils import json_response
 from .schemas import (
     SectionCreateRequest,
     SectionUpdateRequest,
@@ -17,6 +20,7 @@ from .schemas import (
 from fastapi import UploadFile, File, Form, Body
 
 router = APIRouter(prefix="/api/v1/courses", tags=["Courses - Sections"])
+logger = logging.getLogger(__name__)
 
 
 
@@ -59,18 +63,25 @@ async def update_section_in_course(
     description="Upload questions to a specific section in a course via CSV",
 )
 async def upload_questions_to_section(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     course_id: str = Form(...),
     section: str = Form(...),
     current_user: User = Depends(admin_required),
 ):
     """Upload questions to a specific section in a course"""
+    # Reject oversized files before any of them is parsed
+    if file.size and file.size > MAX_CSV_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"CSV too large. Maximum size: {MAX_CSV_SIZE // (1024*1024)}MB",
+        )
+
     try:
-        contents = await file.read()
         result = await CourseQuestionService.upload_questions_to_section(
-            course_id, section, contents, current_user
+            course_id, section, file.file, current_user, background_tasks
         )
-        return result
+        return json_response(result, status_code=status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -129,21 +140,20 @@ async def delete_section_from_course(
     current_user: User = Depends(admin_required),
 ):
     """Delete a section and all its questions from a course (Admin only)"""
-    print(f"🔍 Router delete_section_from_course: course_id={course_id}, section_name='{section_name}'")
     try:
         result = await SectionService.delete_section_from_course(
             course_id, section_name, current_user
         )
-        print(f"✅ Router delete_section_from_course success: {result}")
         return result
     except ValueError as e:
-        print(f"❌ Router delete_section_from_course ValueError: {e}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
     except Exception as e:
-        print(f"❌ Router delete_section_from_course Exception: {e}")
+        logger.exception(
+            "Failed to delete section %r from course %s", section_name, course_id
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete section: {str(e)}",
@@ -264,7 +274,7 @@ async def get_section_questions(
             topic=topic,
             mode=mode,
         )
-        return result
+        return json_response(result)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
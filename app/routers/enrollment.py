@@ -6,12 +6,13 @@ from ..models.user import User
 from ..models.course import Course
 from ..models.course_enrollment import CourseEnrollment
 from ..auth import AuthService
+from ..dependencies import get_current_user
 from ..db import get_db_client
 
 router = APIRouter(prefix="/api/v1/enroll", tags=["enrollment"])
 
 @router.post("/{course_id}")
-async def enroll_course(course_id: str, user: User = Depends(AuthService.get_current_user)):
+async def enroll_course(course_id: str, user: User = Depends(get_current_user)):
     """
     Enroll the current user in the course.
     """
@@ -21,10 +22,13 @@ async def enroll_course(course_id: str, user: User = Depends(AuthService.get_cur
         if not course:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
-        # Enroll user if not already
-        if course_id not in user.enrolled_courses:
+        # Enroll user if not already; the $ne match makes this atomic
+        result = await User.find_one(
+            {"_id": user.id, "enrolled_courses": {"$ne": course_id}}
+        ).update({"$addToSet": {"enrolled_courses": course_id}})
+        if result.matched_count:
             user.enrolled_courses.append(course_id)
-            await user.save()
+            AuthService.invalidate_cached_user(user.email)
 
             # Create course enrollment record with validity period
             expires_at = datetime.now() + timedelta(days=course.validity_period_days)
@@ -38,5 +42,7 @@ async def enroll_course(course_id: str, user: User = Depends(AuthService.get_cur
 
         return {"success": True, "message": f"Enrolled in {course.title}"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
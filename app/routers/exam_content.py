@@ -49,7 +49,7 @@ async def create_exam_content(
             detail=f"ExamContent with exam_code '{data.exam_code}' already exists. Use PUT to update existing content."
         )
 
-    sections = [ExamInfoSection(**sec.dict()) for sec in data.exam_info_sections]
+    sections = [ExamInfoSection(**sec.model_dump()) for sec in data.exam_info_sections]
 
     new_exam_content = ExamContent(
         exam_code=data.exam_code,
@@ -111,7 +111,7 @@ async def update_exam_content(
     content.title = data.title
     content.description = data.description
     content.banner_url = data.banner_url
-    content.exam_info_sections = [ExamInfoSection(**sec.dict()) for sec in data.exam_info_sections]
+    content.exam_info_sections = [ExamInfoSection(**sec.model_dump()) for sec in data.exam_info_sections]
     content.updated_at = datetime.now(timezone.utc)
 
     await content.save()
@@ -199,7 +199,7 @@ async def list_materials(
 
             # Add user progress data if available
             progress = await UserMaterialProgress.find_one(
-                {"user_id": str(current_user.id), "material_id": str(material.id)}
+                {"user_id": current_user.id_str, "material_id": str(material.id)}
             )
 
             if progress:
@@ -291,12 +291,12 @@ async def get_material(
 
         # Check if user progress record exists, create if not
         progress = await UserMaterialProgress.find_one(
-            {"user_id": str(current_user.id), "material_id": material_id}
+            {"user_id": current_user.id_str, "material_id": material_id}
         )
 
         if not progress:
             progress = UserMaterialProgress(
-                user_id=str(current_user.id), material_id=material_id
+                user_id=current_user.id_str, material_id=material_id
             )
             await progress.insert()
         else:
@@ -410,11 +410,11 @@ async def download_material(
         # Track download in background
         async def track_download():
             # Update material download count
-            await material.track_download(str(current_user.id))
+            await material.track_download(current_user.id_str)
 
             # Update user progress
             progress = await UserMaterialProgress.find_one(
-                {"user_id": str(current_user.id), "material_id": material_id}
+                {"user_id": current_user.id_str, "material_id": material_id}
             )
 
             if progress:
@@ -457,12 +457,12 @@ async def update_material_progress(
 
         # Get or create user progress
         progress = await UserMaterialProgress.find_one(
-            {"user_id": str(current_user.id), "material_id": material_id}
+            {"user_id": current_user.id_str, "material_id": material_id}
         )
 
         if not progress:
             progress = UserMaterialProgress(
-                user_id=str(current_user.id), material_id=material_id
+                user_id=current_user.id_str, material_id=material_id
             )
 
         # Update fields
@@ -553,14 +553,14 @@ async def create_material(
             topic=material_data.topic,
             tags=material_data.tags,
             course_ids=material_data.course_ids,
-            created_by=str(current_user.id),
+            created_by=current_user.id_str,
         )
 
         await new_material.insert()
 
         # Log admin action
         admin_action = AdminAction(
-            admin_id=str(current_user.id),
+            admin_id=current_user.id_str,
             action_type=ActionType.CREATE,
             target_collection="study_materials",
             target_id=str(new_material.id),
@@ -598,7 +598,7 @@ async def update_material(
         changes = {}
 
         # Update fields if provided
-        update_dict = material_data.dict(exclude_unset=True)
+        update_dict = material_data.model_dump(exclude_unset=True)
 
         for field, value in update_dict.items():
             if value is not None:
@@ -618,7 +618,7 @@ async def update_material(
 
             # Log admin action
             admin_action = AdminAction(
-                admin_id=str(current_user.id),
+                admin_id=current_user.id_str,
                 action_type=ActionType.UPDATE,
                 target_collection="study_materials",
                 target_id=material_id,
@@ -669,7 +669,7 @@ async def delete_material(
 
         # Log admin action
         admin_action = AdminAction(
-            admin_id=str(current_user.id),
+            admin_id=current_user.id_str,
             action_type=ActionType.DELETE,
             target_collection="study_materials",
             target_id=material_id,
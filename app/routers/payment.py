@@ -48,7 +48,7 @@ async def create_order(
             raise HTTPException(status_code=400, detail="Amount must be greater than 0")
 
         # Create receipt
-        receipt = deterministic_receipt_hex12(request.course_id, str(current_user.id))
+        receipt = deterministic_receipt_hex12(request.course_id, current_user.id_str)
         logger.info(f"[CREATE ORDER] Generated receipt: {receipt}")
 
         # Razorpay order data
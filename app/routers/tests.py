@@ -152,7 +152,7 @@ async def get_test(
         if current_user.role == "admin":
             test_data["created_by"] = test.created_by
             test_data["question_ids"] = test.question_ids
-            test_data["sections"] = [section.dict() for section in test.sections]
+            test_data["sections"] = [section.model_dump() for section in test.sections]
 
         return format_response(message="Test retrieved successfully", data=test_data)
 
@@ -384,7 +384,7 @@ async def get_test_attempt(
             "time_spent_seconds": attempt.time_spent_seconds,
             # Include detailed analytics if attempt is completed
             "section_summaries": (
-                [section.dict() for section in attempt.section_summaries]
+                [section.model_dump() for section in attempt.section_summaries]
                 if attempt.is_completed
                 else []
             ),
@@ -401,7 +401,7 @@ async def get_test_attempt(
         # Include question attempts if attempt is completed
         if attempt.is_completed:
             attempt_data["question_attempts"] = [
-                q.dict() for q in attempt.question_attempts
+                q.model_dump() for q in attempt.question_attempts
             ]
 
         return format_response(
@@ -436,5 +436,5 @@ async def get_test_questions(
 
     return format_response(
         message="Questions retrieved successfully",
-        data=[q.dict() for q in questions]
+        data=[q.model_dump() for q in questions]
     )
\ No newline at end of file
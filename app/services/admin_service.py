@@ -5,6 +5,9 @@ Admin service for common admin functionality
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from fastapi import BackgroundTasks
+
+from ..config import IS_SERVERLESS
 from ..models.admin_action import AdminAction, ActionType
 from ..models.user import User
 
@@ -19,6 +22,7 @@ class AdminService:
         target_collection: str,
         target_id: str,
         changes: Dict[str, Any],
+        background_tasks: Optional[BackgroundTasks] = None,
     ) -> None:
         """
         Centralized admin action logging
@@ -29,6 +33,9 @@ class AdminService:
             target_collection: Collection being modified
             target_id: ID of the target record
             changes: Dictionary of changes made
+            background_tasks: If given, the insert runs after the response is
+                sent (inline on serverless, where instances are frozen once
+                the response is returned)
         """
         admin_action = AdminAction(
             admin_id=admin_id,
@@ -37,6 +44,9 @@ class AdminService:
             target_id=target_id,
             changes=changes,
         )
+        if background_tasks is not None and not IS_SERVERLESS:
+            background_tasks.add_task(admin_action.insert)
+            return
         await admin_action.insert()
 
     @staticmethod
@@ -1,5 +1,9 @@
+import logging
 from typing import List, Optional
-from ..models.banner import Banner
+from beanie import PydanticObjectId
+from ..models.banner import Banner, BannerListView
+
+logger = logging.getLogger(__name__)
 
 
 class BannerService:
@@ -7,22 +11,20 @@ class BannerService:
     @staticmethod
     async def create_banner(image_url: str, title: Optional[str] = None):
         try:
-            print("try mein bhi aa gaye hai laLA")
             banner = Banner(
                 title=title,
                 image_url=image_url
             )
             await banner.insert()
-            print("banner create ho chuka hai ")
             return banner
         except Exception as e:
-            print(e)
+            logger.error(f"Failed to create banner: {str(e)}")
             raise e
 
     @staticmethod
-    async def get_all_banners() -> List[Banner]:
+    async def get_all_banners() -> List[BannerListView]:
         banners = (
-            await Banner.find(Banner.is_active == True)
+            await Banner.find(Banner.is_active == True, projection_model=BannerListView)
             .sort("+position", "-created_at")
             .to_list()
         )
@@ -34,12 +36,12 @@ class BannerService:
 
     @staticmethod
     async def delete_banner(banner_id: str) -> bool:
-        banner = await Banner.get(banner_id)
+        # Single delete round trip; deleted_count doubles as the existence check
+        result = await Banner.find_one(Banner.id == PydanticObjectId(banner_id)).delete()
 
-        if not banner:
+        if not result or result.deleted_count == 0:
             raise ValueError("Banner not found")
 
-        await banner.delete()
         return True
 
     @staticmethod
@@ -0,0 +1,23 @@
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+# Course listing responses keyed by their normalised filters. The catalog
+# changes rarely, so a short TTL bounds staleness across workers while
+# local writes clear the cache straight away (see Course's event hooks).
+_list_cache: TTLCache = TTLCache(maxsize=512, ttl=30)
+
+
+def get_listing(key: Hashable) -> Optional[Dict[str, Any]]:
+    """Return a cached listing response, if any"""
+    return _list_cache.get(key)
+
+
+def put_listing(key: Hashable, response: Dict[str, Any]) -> None:
+    """Cache a listing response"""
+    _list_cache[key] = response
+
+
+def invalidate() -> None:
+    """Forget every cached listing, e.g. after a course is written"""
+    _list_cache.clear()
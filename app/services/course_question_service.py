@@ -2,25 +2,240 @@
 Course question service for question management within course sections
 """
 
-from typing import Dict, Any, List, Optional
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import codecs
 import csv
-import io
+import logging
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
 from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import BackgroundTasks
 
-from ..models.course import Course
-from ..models.question import Question, QuestionType, DifficultyLevel, QuestionOption
+from ..models.course import Course, SECTION_NAMES_EXPR
+from ..models.question import Question, QuestionType, DifficultyLevel
 from ..models.admin_action import AdminAction, ActionType
 from ..models.user import User
 from ..config import settings
 from .admin_service import AdminService
 
+logger = logging.getLogger(__name__)
+
+# Largest CSV accepted for a question upload
+MAX_CSV_SIZE = 200 * 1024 * 1024  # 200MB
+# Rows decoded and built per parse-thread hop while streaming an uploaded CSV
+CSV_CHUNK_ROWS = 1000
+# Chunk inserts allowed in flight while later chunks are still being parsed.
+# Each holds one pooled connection; well under MONGO_MAX_POOL_SIZE so a few
+# uploads at once never starve regular requests of connections
+CSV_INSERT_CONCURRENCY = 4
+# Dedicated threads for decoding and building uploaded CSVs, so a large
+# upload never competes with the sync dependencies and file I/O sharing
+# Starlette's default threadpool. Parsing holds the GIL, so more threads
+# than this would not parse any faster
+CSV_PARSE_WORKERS = 4
+csv_executor = ThreadPoolExecutor(
+    max_workers=CSV_PARSE_WORKERS, thread_name_prefix="csv-parse"
+)
+# Rejected rows kept as examples for the upload's single warning log
+CSV_ERROR_SAMPLES = 20
+
+
+# Columns read from an uploaded CSV, in the order parse_row unpacks them,
+# with the value used when a column or cell is missing
+_CSV_COLUMNS = (
+    ("question", ""),
+    ("option_a", ""),
+    ("option_b", ""),
+    ("option_c", ""),
+    ("option_d", ""),
+    ("correct_answer", ""),
+    ("explanation", ""),
+    ("remarks", ""),
+    ("subject", "General"),
+    ("topic", "General"),
+    ("negative_marks", None),
+)
+
+
+def _course_oid(course_id: str) -> ObjectId:
+    """Parse a course id once, for reuse in every query that needs it"""
+    # ObjectId(None) would mint a fresh id rather than fail
+    if isinstance(course_id, str):
+        try:
+            return ObjectId(course_id)
+        except InvalidId:
+            pass
+    raise ValueError("Invalid course ID format")
+
+# Answer letters for option_a..option_d, in column order
+_OPTION_LETTERS = "ABCD"
+
+
+class _QuestionCsvParser:
+    """
+    Turns rows of an uploaded question CSV into stored Question documents.
+
+    Everything here is synchronous and runs on csv_executor, so the event
+    loop only ever sees finished chunks of documents.
+    """
+
+    def __init__(
+        self,
+        header: List[str],
+        course_id: str,
+        section: str,
+        created_by: str,
+        now: datetime,
+    ):
+        # Resolve column positions once. Every row is padded to the header
+        # width with per-column defaults, followed by one slot per column
+        # the file lacks, so a single itemgetter pulls all fields at once
+        defaults = dict(_CSV_COLUMNS)
+        columns = {name: i for i, name in enumerate(header)}
+        self.width = len(header)
+        self.padding = [defaults.get(name, "") for name in header]
+        indices = []
+        for name, default in _CSV_COLUMNS:
+            if name not in columns:
+                columns[name] = len(self.padding)
+                self.padding.append(default)
+            indices.append(columns[name])
+        self.pick = operator.itemgetter(*indices)
+
+        # Invariant for the whole upload: every question is stamped alike
+        self.course_id = course_id
+        self.section = section
+        self.created_by = created_by
+        self.now = now
+
+        # Rejected rows are tallied and reported once, after the upload
+        self.skipped = 0
+        self.error_samples: List[Tuple[List[str], str]] = []
+
+    def parse_row(self, row: List[str]) -> Dict[str, Any]:
+        """Build one Question document, raising ValueError on bad input"""
+        del row[self.width :]
+        row += self.padding[len(row) :]
+        (
+            question_text,
+            option_a,
+            option_b,
+            option_c,
+            option_d,
+            correct_answer,
+            explanation,
+            remarks,
+            subject,
+            topic,
+            negative_raw,
+        ) = self.pick(row)
+
+        # Extract options with correct format; blank options are dropped but
+        # keep their letter's position as order
+        correct_answer = correct_answer.strip().upper()
+        remarks = remarks.strip()
+        options = [
+            {
+                "text": opt_text,
+                "is_correct": option_letter == correct_answer,
+                "order": i,
+                "image_urls": [],
+            }
+            for i, (option_letter, opt_text) in enumerate(
+                zip(
+                    _OPTION_LETTERS,
+                    (option_a.strip(), option_b.strip(), option_c.strip(), option_d.strip()),
+                )
+            )
+            if opt_text
+        ]
+
+        # Get question text and create title
+        question_text = question_text.strip()
+        title = question_text[:50] + ("..." if len(question_text) > 50 else "")
+
+        # Extract explanation and remarks
+        explanation = explanation.strip() or None
+
+        # Optional negative marks (positive number indicating deduction on incorrect)
+        negative_val = 0.0
+        if negative_raw is not None and negative_raw.strip():
+            try:
+                negative_val = float(negative_raw)
+            except ValueError:
+                negative_val = None
+            if negative_val is None or negative_val < 0:
+                raise ValueError(f"Invalid negative_marks value: {negative_raw}")
+
+        # Map CSV row straight to the stored Question shape; every value is
+        # already a plain str/float/bool, so building a Question model per
+        # row would only re-validate it
+        return {
+            "is_active": True,
+            "created_at": self.now,
+            "updated_at": self.now,
+            "title": title,
+            "question_text": question_text,
+            "question_type": QuestionType.MCQ.value,
+            "difficulty_level": DifficultyLevel.MEDIUM.value,  # Default difficulty
+            "course_id": self.course_id,
+            "section": self.section,
+            "exam_year": None,
+            "options": options,
+            "explanation": explanation,
+            "remarks": remarks or None,
+            "question_image_urls": [],
+            "explanation_image_urls": [],
+            "remarks_image_urls": [],
+            "subject": subject.strip(),
+            "topic": topic.strip(),
+            "tags": [],
+            # Persist in metadata for downstream scoring
+            "metadata": {"negative_marks": negative_val},
+            "created_by": self.created_by,
+        }
+
+    def parse_chunk(
+        self, reader: Iterator[List[str]], count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read up to `count` rows and build their documents.
+
+        Returns:
+            The chunk's valid documents (possibly empty), or None once the
+            reader is exhausted
+        """
+        rows = list(islice(reader, count))
+        if not rows:
+            return None
+
+        questions = []
+        for row in rows:
+            if not row:
+                continue  # Blank line
+            try:
+                questions.append(self.parse_row(row))
+            except ValueError as e:
+                self.skipped += 1
+                if len(self.error_samples) < CSV_ERROR_SAMPLES:
+                    self.error_samples.append((row[: self.width], str(e)))
+        return questions
+
 
 class CourseQuestionService:
     """Service class for course question management operations"""
 
     @staticmethod
     async def upload_questions_to_section(
-        course_id: str, section: str, file_content: bytes, current_user: User
+        course_id: str,
+        section: str,
+        csv_file: BinaryIO,
+        current_user: User,
+        background_tasks: Optional[BackgroundTasks] = None,
     ) -> Dict[str, Any]:
         """
         Upload questions to a specific section in a course
@@ -28,120 +243,118 @@ class CourseQuestionService:
         Args:
             course_id: Course ID
             section: Section name
-            file_content: CSV file content
+            csv_file: Binary file object holding the uploaded CSV
             current_user: User uploading questions
+            background_tasks: Defers the admin action log past the response
 
         Returns:
             Dictionary with upload result
         """
         # Validate course_id
-        if not ObjectId.is_valid(course_id):
-            raise ValueError("Invalid course ID format")
+        oid = _course_oid(course_id)
 
-        # Get the course
-        course = await Course.get(course_id)
+        # Check the course and its section in one lookup that returns only
+        # the answer, rather than the whole course document
+        course = await Course.get_pymongo_collection().find_one(
+            {"_id": oid},
+            {"has_section": {"$in": [section, SECTION_NAMES_EXPR]}},
+        )
         if not course:
             raise ValueError("Course not found")
 
         # Validate section exists in course
-        section_names = course.get_section_names()
-        if not section_names or section not in section_names:
+        if not course["has_section"]:
             raise ValueError(f"Section '{section}' not found in course")
 
-        # Read and parse CSV file
-        text = file_content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(text))
+        # Decode and parse the upload incrementally off the event loop, so
+        # the file is never held in memory as one bytes + one str copy
+        csv_reader = csv.reader(codecs.getreader("utf-8-sig")(csv_file))
 
-        questions = []
-        for row in csv_reader:
+        loop = asyncio.get_running_loop()
+        header = await loop.run_in_executor(csv_executor, next, csv_reader, [])
+        uploaded_at = datetime.now(timezone.utc)
+        parser = _QuestionCsvParser(
+            header, course_id, section, current_user.id_str, uploaded_at
+        )
+
+        uploaded = 0
+        in_flight = asyncio.Semaphore(CSV_INSERT_CONCURRENCY)
+        inserts = []
+
+        collection = Question.get_pymongo_collection()
+
+        async def insert_chunk(questions: List[Dict[str, Any]]) -> None:
             try:
-                # Extract options with correct format
-                options = []
-                correct_answer = row.get("correct_answer", "").strip().upper()
-                remarks = row.get("remarks", "").strip()
-                for i, opt_key in enumerate(
-                    ["option_a", "option_b", "option_c", "option_d"]
-                ):
-                    opt_text = row.get(opt_key, "").strip()
-                    if opt_text:
-                        option_letter = chr(65 + i)  # A, B, C, D
-                        options.append(
-                            QuestionOption(
-                                text=opt_text,
-                                is_correct=option_letter == correct_answer,
-                                order=i,
-                            )
-                        )
-
-                # Get question text and create title
-                question_text = row.get("question", "").strip()
-                title = question_text[:50] + ("..." if len(question_text) > 50 else "")
-
-                # Extract explanation and remarks
-                explanation = row.get("explanation", "").strip() or None
-
-                # Map CSV row to Question model
-                question = Question(
-                    title=title,
-                    question_text=question_text,
-                    question_type=QuestionType.MCQ,
-                    difficulty_level=DifficultyLevel.MEDIUM,  # Default difficulty
-                    course_id=course_id,
-                    section=section,
-                    options=options,
-                    explanation=explanation,
-                    remarks=remarks or None,
-                    subject=row.get("subject", "General").strip(),
-                    topic=row.get("topic", "General").strip(),
-                    tags=[],
-                    created_by=str(current_user.id),
-                )
+                await collection.insert_many(questions, ordered=False)
+            finally:
+                in_flight.release()
 
-                # Optional negative marks (positive number indicating deduction on incorrect)
-                negative_raw = row.get("negative_marks")
-                try:
-                    if negative_raw is not None and str(negative_raw).strip() != "":
-                        negative_val = float(str(negative_raw).strip())
-                        if negative_val < 0:
-                            raise ValueError("negative_marks must be non-negative")
-                    else:
-                        negative_val = 0.0
-                except Exception:
-                    raise ValueError(f"Invalid negative_marks value: {negative_raw}")
-
-                # Persist in metadata for downstream scoring
-                try:
-                    question.metadata = getattr(question, "metadata", {}) or {}
-                except Exception:
-                    question.metadata = {}
-                question.metadata["negative_marks"] = negative_val
-
-                questions.append(question)
-            except Exception as e:
-                print(f"Error processing row: {row}. Error: {str(e)}")
-                continue
-
-        # Save questions to database
-        if questions:
-            await Question.insert_many(questions)
+        try:
+            try:
+                # Reading, decoding and building documents all happen on the
+                # parse threads; only the inserts run on the event loop
+                while (
+                    questions := await loop.run_in_executor(
+                        csv_executor, parser.parse_chunk, csv_reader, CSV_CHUNK_ROWS
+                    )
+                ) is not None:
+                    # Save each chunk while the next one is parsed; unordered so
+                    # one failed document does not stop the rest of the batch.
+                    # Waiting for a slot bounds how many parsed chunks sit in
+                    # memory
+                    if questions:
+                        await in_flight.acquire()
+                        inserts.append(asyncio.create_task(insert_chunk(questions)))
+                        uploaded += len(questions)
+            finally:
+                results = await asyncio.gather(*inserts, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        except Exception:
+            # A decode/CSV error late in the file, or a failed chunk insert,
+            # must not leave part of the upload behind for a retry to
+            # duplicate. Every document of this upload carries the same
+            # creator and created_at stamp, so they can be removed without
+            # remembering each id
+            if inserts:
+                await collection.delete_many(
+                    {
+                        "course_id": course_id,
+                        "section": section,
+                        "created_by": current_user.id_str,
+                        "created_at": uploaded_at,
+                    }
+                )
+            raise
+
+        if parser.skipped:
+            logger.warning(
+                "Skipped %d invalid rows uploading to course %s section %r; samples: %s",
+                parser.skipped,
+                course_id,
+                section,
+                parser.error_samples,
+            )
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "questions",
             course_id,
             {
                 "action": "questions_uploaded",
-                "count": len(questions),
+                "count": uploaded,
                 "section": section,
             },
+            background_tasks,
         )
 
         return {
             "status": "success",
-            "message": f"Successfully uploaded {len(questions)} questions to section '{section}'",
-            "count": len(questions),
+            "message": f"Successfully uploaded {uploaded} questions to section '{section}'",
+            "count": uploaded,
         }
 
     @staticmethod
@@ -169,10 +382,7 @@ class CourseQuestionService:
         Returns:
             Dictionary with questions and pagination info
         """
-        if not ObjectId.is_valid(course_id):
-            raise ValueError("Invalid course ID format")
-
-        course = await Course.get(course_id)
+        course = await Course.get(_course_oid(course_id))
         if not course:
             raise ValueError("Course not found")
 
@@ -2,18 +2,106 @@
 Course service for course management operations
 """
 
+import asyncio
+import base64
+import logging
+import operator
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from bson.errors import InvalidId
+import orjson
 import re
 
-from ..models.course import Course, Section
+from ..models.course import (
+    Course,
+    CourseEnrolledView,
+    CourseEnrollmentView,
+    CourseListView,
+    FINAL_PRICE_EXPR,
+    Section,
+    discounted_price,
+)
 from ..models.question import Question
 from ..models.admin_action import ActionType
 from ..models.user import User
 from ..models.course_enrollment import CourseEnrollment
 from ..models.enums import ExamCategory
+from ..auth import AuthService
 from .admin_service import AdminService
+from . import course_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Longest search string used; bounds regex and text search work per request
+_MAX_SEARCH_LENGTH = 64
+
+# Course fields returned by list_courses, besides id
+_LISTING_FIELDS = (
+    "title",
+    "code",
+    "category",
+    "sub_category",
+    "description",
+    "sections",
+    "price",
+    "is_free",
+    "discount_percent",
+    "final_price",
+    "validity_period_days",
+    "icon_url",
+    "banner_url",
+    "mock_test_timer_seconds",
+    "material_ids",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+_listing_values = operator.attrgetter(*_LISTING_FIELDS)
+
+
+def _listing_sort(sort_order: str) -> List[Tuple[str, int]]:
+    """Sort keys for course listings; _id last so every position is unique"""
+    direction = 1 if sort_order == "asc" else -1
+    return [
+        ("priority_order", direction),
+        ("category", 1),
+        ("title", 1),
+        ("_id", 1),
+    ]
+
+
+def _encode_cursor(course: CourseListView) -> str:
+    """Opaque cursor holding the sort key of the last course on a page"""
+    raw = orjson.dumps(
+        [course.priority_order, course.category.value, course.title, str(course.id)]
+    )
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _keyset_filter(sort: List[Tuple[str, int]], cursor: str) -> Dict[str, Any]:
+    """
+    Build the range filter matching every course after `cursor` in `sort` order.
+
+    Raises:
+        ValueError: If the cursor cannot be decoded
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values[-1] = ObjectId(values[-1])
+    except (ValueError, InvalidId, IndexError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid pagination cursor")
+
+    # (a > x) or (a == x and b > y) or ... over the sort keys in order
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {sort[j][0]: values[j] for j in range(i)}
+        branch[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        branches.append(branch)
+    return {"$or": branches}
 
 
 class CourseService:
@@ -34,7 +122,9 @@ class CourseService:
             Dictionary with course creation result
         """
         # Check if course code already exists
-        existing_course = await Course.find_one({"code": course_data["code"]})
+        existing_course = await Course.get_pymongo_collection().find_one(
+            {"code": course_data["code"]}, {"_id": 1}
+        )
         if existing_course:
             raise ValueError("Course with this code already exists")
 
@@ -69,14 +159,14 @@ class CourseService:
             priority_order=course_data.get("priority_order", 0),
             banner_url=course_data.get("banner_url"),
             tagline=course_data.get("tagline"),
-            created_by=str(current_user.id),
+            created_by=current_user.id_str,
         )
 
         await new_course.insert()
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "courses",
             str(new_course.id),
@@ -99,7 +189,10 @@ class CourseService:
         sort_order: str = "asc",
         page: int = 1,
         limit: int = 10,
-        current_user: Optional[User] = None,
+        is_admin: bool = False,
+        include_total: bool = False,
+        after: Optional[str] = None,
+        fuzzy: bool = False,
     ) -> Dict[str, Any]:
         """
         List courses with filtering and pagination
@@ -110,11 +203,14 @@ class CourseService:
             section: Filter by section
             is_free: Filter by free courses
             is_active: Filter by active status
-            sort_by: Field to sort by
+            sort_by: Field to sort by ("relevance" ranks text search matches)
             sort_order: Sort order (asc or desc)
-            page: Page number
+            page: Page number (deprecated, ignored when `after` is given)
             limit: Items per page
-            current_user: Current user (for access control)
+            is_admin: Whether the caller is an admin (may see inactive courses)
+            include_total: Also count all matching courses (an extra query)
+            after: Cursor from the previous page's `next_cursor`
+            fuzzy: Match `search` as a substring instead of via the text index
 
         Returns:
             Dictionary with courses and pagination info
@@ -123,11 +219,34 @@ class CourseService:
         query_filters = {}
 
         # Always filter by is_active=True for non-admin users
-        if current_user is None or current_user.role != "admin":
+        if not is_admin:
             query_filters["is_active"] = True
         elif is_active is not None:
             query_filters["is_active"] = is_active
 
+        if search:
+            search = search[:_MAX_SEARCH_LENGTH]
+
+        # Anonymous and student requests share entries; only the effective
+        # filters matter, not who asked
+        cache_key = (
+            query_filters.get("is_active"),
+            category,
+            search,
+            section,
+            is_free,
+            sort_by == "relevance",
+            sort_order,
+            page,
+            limit,
+            include_total,
+            after,
+            fuzzy,
+        )
+        cached = course_cache.get_listing(cache_key)
+        if cached is not None:
+            return cached
+
         if category:
             query_filters["category"] = category
 
@@ -137,87 +256,96 @@ class CourseService:
         if is_free is not None:
             query_filters["is_free"] = is_free
 
-        if search:
-            # Search in title or description
-            query_filters["$or"] = [
-                {"title": {"$regex": search, "$options": "i"}},
-                {"description": {"$regex": search, "$options": "i"}},
-            ]
-
-        # Calculate pagination
-        skip = (page - 1) * limit
-
-        # Set sort order with secondary sort for consistent category ordering across auth states
-        sort_direction = 1 if sort_order == "asc" else -1
-
-        # Primary sort by priority_order, secondary sort by category for consistent ordering
-        sort_criteria = [
-            ("priority_order", sort_direction),
-            ("category", 1),
-            ("title", 1),
-        ]
+        relevance = False
+        if search and fuzzy:
+            # Literal substring match in title or description; scans every
+            # candidate, so the input is escaped and length-capped
+            pattern = {"$regex": re.escape(search), "$options": "i"}
+            query_filters["$or"] = [{"title": pattern}, {"description": pattern}]
+        elif search:
+            # Word match through the course_text_idx text index
+            query_filters["$text"] = {"$search": search}
+            relevance = sort_by == "relevance"
+
+        # Page by the sort key of the last course seen so each page is an
+        # index range scan; page/skip stays for clients that have not moved
+        if relevance:
+            sort_criteria = [("score", {"$meta": "textScore"}), ("_id", 1)]
+            if after:
+                raise ValueError(
+                    "Cursor pagination is not supported for relevance sort"
+                )
+        else:
+            sort_criteria = _listing_sort(sort_order)
+        page_filters = query_filters
+        skip = 0
+        if after:
+            page_filters = {
+                "$and": [query_filters, _keyset_filter(sort_criteria, after)]
+            }
+        else:
+            skip = (page - 1) * limit
 
-        # Fetch courses with improved sorting for consistent category ordering
-        courses = (
-            await Course.find(query_filters)
+        # Fetch one extra course to learn whether another page exists
+        # without counting the whole filter set
+        page_query = (
+            Course.find(page_filters, projection_model=CourseListView)
             .sort(sort_criteria)
             .skip(skip)
-            .limit(limit)
+            .limit(limit + 1)
             .to_list()
         )
+        total_courses = None
+        if include_total:
+            courses, total_courses = await asyncio.gather(
+                page_query, Course.find(query_filters).count()
+            )
+        else:
+            courses = await page_query
 
-        # Count total matching courses for pagination info
-        total_courses = await Course.find(query_filters).count()
-        total_pages = (total_courses + limit - 1) // limit
+        has_next = len(courses) > limit
+        courses = courses[:limit]
 
-        # Convert course objects to response format
         course_responses = []
         for course in courses:
-            course_data = {
-                "id": str(course.id),
-                "title": course.title,
-                "code": course.code,
-                "category": course.category.value,
-                "sub_category": course.sub_category,
-                "description": course.description,
-                "sections": course.sections,
-                "price": course.price,
-                "is_free": course.is_free,
-                "discount_percent": course.discount_percent,
-                "validity_period_days": getattr(course, "validity_period_days", 365),
-                "icon_url": getattr(course, "icon_url", None),
-                "banner_url": getattr(course, "banner_url", None),
-                "mock_test_timer_seconds": getattr(
-                    course, "mock_test_timer_seconds", 3600
-                ),
-                "material_ids": course.material_ids,
-                "is_active": course.is_active,
-                "created_at": course.created_at,
-                "updated_at": course.updated_at,
-            }
-            course_responses.append(course_data)
+            row = dict(zip(_LISTING_FIELDS, _listing_values(course)))
+            row["category"] = course.category.value
+            course_responses.append({"id": str(course.id), **row})
+
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "has_next": has_next,
+            "next_page": page + 1 if has_next else None,
+            "next_cursor": (
+                _encode_cursor(courses[-1]) if has_next and not relevance else None
+            ),
+        }
+        if total_courses is not None:
+            pagination["total"] = total_courses
+            pagination["total_pages"] = (total_courses + limit - 1) // limit
 
-        return {
+        logger.debug("list_courses filters=%s returned=%d", query_filters, len(courses))
+
+        response = {
             "message": "Courses retrieved successfully",
             "data": course_responses,
-            "pagination": {
-                "total": total_courses,
-                "page": page,
-                "limit": limit,
-                "total_pages": total_pages,
-            },
+            "pagination": pagination,
         }
+        course_cache.put_listing(cache_key, response)
+        return response
 
     @staticmethod
     async def get_course_statistics() -> Dict[str, Any]:
         """Aggregate course statistics for admin dashboards."""
 
-        total_courses = await Course.find({}).count()
-        active_courses = await Course.find({"is_active": True}).count()
+        total_courses, active_courses, latest_course = await asyncio.gather(
+            Course.find({}).count(),
+            Course.find({"is_active": True}).count(),
+            Course.find({}).sort("-updated_at").limit(1).to_list(),
+        )
         inactive_courses = total_courses - active_courses
 
-        latest_course = await Course.find({}).sort("-updated_at").limit(1).to_list()
-
         last_updated_at = (
             latest_course[0].updated_at.isoformat()
             if latest_course and latest_course[0].updated_at
@@ -273,6 +401,11 @@ class CourseService:
                 "price": course.price,
                 "is_free": course.is_free,
                 "discount_percent": course.discount_percent,
+                "final_price": (
+                    course.final_price
+                    if course.final_price is not None
+                    else discounted_price(course.price, course.discount_percent)
+                ),
                 "validity_period_days": getattr(course, "validity_period_days", 365),
                 "mock_test_timer_seconds": getattr(
                     course, "mock_test_timer_seconds", 3600
@@ -304,44 +437,57 @@ class CourseService:
         Returns:
             Dictionary with update result
         """
-        course = await Course.get(course_id)
-        if not course:
+        if not ObjectId.is_valid(course_id):
             raise ValueError("Course not found")
+        oid = ObjectId(course_id)
 
-        # Track changes for audit log
-        changes = {}
-
-        # Update fields if provided
-        for field, value in course_data.items():
-            if value is not None:
-                setattr(course, field, value)
-                changes[field] = (
-                    str(value) if not isinstance(value, list) else "updated"
-                )
+        # Only provided fields are written; the audit log mirrors them
+        update = {
+            field: value for field, value in course_data.items() if value is not None
+        }
+        changes = {
+            field: str(value) if not isinstance(value, list) else "updated"
+            for field, value in update.items()
+        }
 
-        # Only update if there are changes
-        if changes:
-            course.update_timestamp()
-            await course.save()
-            # Log admin action
-            await AdminService.log_admin_action(
-                str(current_user.id),
-                ActionType.UPDATE,
-                "courses",
-                course_id,
-                changes,
-            )
-            return {
-                "message": "Course updated successfully",
-                "course_id": course_id,
-                "changes": changes,
-            }
-        else:
+        if not changes:
+            if not await Course.get_pymongo_collection().count_documents(
+                {"_id": oid}, limit=1
+            ):
+                raise ValueError("Course not found")
             return {
                 "message": "No changes to apply",
                 "course_id": course_id,
             }
 
+        update["updated_at"] = datetime.now(timezone.utc)
+        # A pipeline update so final_price is derived from the new values in
+        # the same write; $literal keeps user text from being read as an
+        # expression
+        result = await Course.get_pymongo_collection().update_one(
+            {"_id": oid},
+            [
+                {"$set": {field: {"$literal": v} for field, v in update.items()}},
+                {"$set": {"final_price": FINAL_PRICE_EXPR}},
+            ],
+        )
+        if not result.matched_count:
+            raise ValueError("Course not found")
+        course_cache.invalidate()
+
+        await AdminService.log_admin_action(
+            current_user.id_str,
+            ActionType.UPDATE,
+            "courses",
+            course_id,
+            changes,
+        )
+        return {
+            "message": "Course updated successfully",
+            "course_id": course_id,
+            "changes": changes,
+        }
+
     @staticmethod
     async def delete_course(course_id: str, current_user: User) -> Dict[str, Any]:
         """
@@ -362,41 +508,38 @@ class CourseService:
         section_names = course.get_section_names()
         section_count = len(section_names)
 
-        # Delete all questions associated with the course
-        question_delete_result = await Question.find(
-            {"course_id": course_id}
-        ).delete_many()
+        # Delete all questions and enrollments associated with the course
+        question_delete_result, enrollment_delete_result = await asyncio.gather(
+            Question.find({"course_id": course_id}).delete_many(),
+            CourseEnrollment.find({"course_id": course_id}).delete_many(),
+        )
         deleted_questions = getattr(
             question_delete_result,
             "deleted_count",
             getattr(question_delete_result, "n", 0),
         )
 
-        # Delete enrollments referencing this course
-        enrollment_delete_result = await CourseEnrollment.find(
-            {"course_id": course_id}
-        ).delete_many()
         deleted_enrollments = getattr(
             enrollment_delete_result,
             "deleted_count",
             getattr(enrollment_delete_result, "n", 0),
         )
 
-        # Remove the course document itself (hard delete)
-        await course.delete()
-
-        # Log admin action
-        await AdminService.log_admin_action(
-            str(current_user.id),
-            ActionType.DELETE,
-            "courses",
-            course_id,
-            {
-                "action": "course_deleted",
-                "deleted_sections": section_count,
-                "deleted_questions": deleted_questions,
-                "deleted_enrollments": deleted_enrollments,
-            },
+        # Remove the course document itself (hard delete) and log it
+        await asyncio.gather(
+            course.delete(),
+            AdminService.log_admin_action(
+                current_user.id_str,
+                ActionType.DELETE,
+                "courses",
+                course_id,
+                {
+                    "action": "course_deleted",
+                    "deleted_sections": section_count,
+                    "deleted_questions": deleted_questions,
+                    "deleted_enrollments": deleted_enrollments,
+                },
+            ),
         )
 
         return {
@@ -407,6 +550,52 @@ class CourseService:
             "deleted_enrollments": deleted_enrollments,
         }
 
+    @staticmethod
+    async def _enroll(
+        course: CourseEnrollmentView, current_user: User, source: str, message: str
+    ) -> Dict[str, Any]:
+        """Atomically add the course to the user and record the enrollment"""
+        course_id = str(course.id)
+        now = datetime.now(timezone.utc)
+
+        # Matching only users without the course makes a concurrent duplicate
+        # request a no-op, so the enrollment record and counter below are
+        # written at most once
+        result = await User.find_one(
+            {"_id": current_user.id, "enrolled_courses": {"$ne": course_id}}
+        ).update(
+            {"$addToSet": {"enrolled_courses": course_id}, "$set": {"updated_at": now}}
+        )
+        if not result.matched_count:
+            return {
+                "message": "You are already enrolled in this course",
+                "course_id": course_id,
+                "course_title": course.title,
+            }
+        current_user.enrolled_courses.append(course_id)
+        current_user.updated_at = now
+        AuthService.invalidate_cached_user(current_user.email)
+
+        enrollment = CourseEnrollment(
+            user_id=current_user.id_str,
+            course_id=course_id,
+            expires_at=datetime.now() + timedelta(days=course.validity_period_days),
+            enrollment_source=source,
+        )
+        await asyncio.gather(
+            enrollment.insert(),
+            Course.find_one({"_id": course.id}).update(
+                {"$inc": {"enrolled_students_count": 1}, "$set": {"updated_at": now}}
+            ),
+        )
+        course_cache.invalidate()
+
+        return {
+            "message": message,
+            "course_id": course_id,
+            "course_title": course.title,
+        }
+
     @staticmethod
     async def enroll_user_in_course(
         course_id: str, current_user: User
@@ -421,7 +610,11 @@ class CourseService:
         Returns:
             Dictionary with enrollment result
         """
-        course = await Course.get(course_id)
+        course = None
+        if ObjectId.is_valid(course_id):
+            course = await Course.find_one(
+                {"_id": ObjectId(course_id)}, projection_model=CourseEnrollmentView
+            )
         if not course:
             raise ValueError("Course not found")
 
@@ -436,79 +629,30 @@ class CourseService:
                 "course_title": course.title,
             }
 
-        # For free courses, enroll directly
+        # Free courses and premium users enroll directly
         if course.is_free:
-            # Add course to user's enrolled courses
-            if course_id not in current_user.enrolled_courses:
-                current_user.enrolled_courses.append(course_id)
-                current_user.update_timestamp()
-                await current_user.save()
-
-                # Create course enrollment record
-                expires_at = datetime.now() + timedelta(
-                    days=course.validity_period_days
-                )
-                enrollment = CourseEnrollment(
-                    user_id=str(current_user.id),
-                    course_id=course_id,
-                    expires_at=expires_at,
-                    enrollment_source="free_enrollment",
-                )
-                await enrollment.insert()
-
-                # Increment enrolled students count
-                course.enrolled_students_count += 1
-                course.update_timestamp()
-                await course.save()
-
-                return {
-                    "message": "Successfully enrolled in free course",
-                    "course_id": course_id,
-                    "course_title": course.title,
-                }
+            return await CourseService._enroll(
+                course,
+                current_user,
+                "free_enrollment",
+                "Successfully enrolled in free course",
+            )
         else:
             # For paid courses, check if the user has premium access or has purchased this course
             if current_user.has_premium_access:
-                # Premium users can access all courses
-                if course_id not in current_user.enrolled_courses:
-                    current_user.enrolled_courses.append(course_id)
-                    current_user.update_timestamp()
-                    await current_user.save()
-
-                    # Create course enrollment record
-                    expires_at = datetime.now() + timedelta(
-                        days=course.validity_period_days
-                    )
-                    enrollment = CourseEnrollment(
-                        user_id=str(current_user.id),
-                        course_id=course_id,
-                        expires_at=expires_at,
-                        enrollment_source="premium_access",
-                    )
-                    await enrollment.insert()
-
-                    # Increment enrolled students count
-                    course.enrolled_students_count += 1
-                    course.update_timestamp()
-                    await course.save()
-
-                    return {
-                        "message": "Successfully enrolled with premium access",
-                        "course_id": course_id,
-                        "course_title": course.title,
-                    }
+                return await CourseService._enroll(
+                    course,
+                    current_user,
+                    "premium_access",
+                    "Successfully enrolled with premium access",
+                )
             else:
                 # Redirect to payment flow for non-premium users
-                price = course.price
-                if course.discount_percent:
-                    discount_amount = (course.price * course.discount_percent) / 100
-                    price = course.price - discount_amount
-
                 return {
                     "message": "Payment required to enroll in this course",
                     "course_id": course_id,
                     "course_title": course.title,
-                    "price": price,
+                    "price": course.final_price,
                     "original_price": course.price,
                     "discount_percent": course.discount_percent,
                     "requires_payment": True,
@@ -535,13 +679,11 @@ class CourseService:
             }
 
         # Convert string IDs to ObjectIds for the database query
-        object_ids = []
-        for course_id in enrolled_course_ids:
-            try:
-                object_ids.append(ObjectId(course_id))
-            except Exception as e:
-                print(f"Invalid ObjectId: {course_id}, error: {e}")
-                continue
+        object_ids = [ObjectId(i) for i in enrolled_course_ids if ObjectId.is_valid(i)]
+        if len(object_ids) != len(enrolled_course_ids):
+            logger.warning(
+                "User %s has invalid enrolled course ids", current_user.id_str
+            )
 
         if not object_ids:
             return {
@@ -550,29 +692,25 @@ class CourseService:
             }
 
         courses = await Course.find(
-            {"_id": {"$in": object_ids}, "is_active": True}
+            {"_id": {"$in": object_ids}, "is_active": True},
+            projection_model=CourseEnrolledView,
         ).to_list()
 
-        # Convert course objects to response format
-        course_responses = []
-        for course in courses:
-            # Convert Section objects to strings for response
-            sections_list = course.get_section_names()
-
-            course_responses.append(
-                {
-                    "id": str(course.id),
-                    "title": course.title,
-                    "code": course.code,
-                    "category": course.category.value,
-                    "sub_category": course.sub_category,
-                    "description": course.description,
-                    "sections": sections_list,
-                    "icon_url": course.icon_url,
-                    "material_ids": course.material_ids,
-                    "test_series_ids": course.test_series_ids,
-                }
-            )
+        course_responses = [
+            {
+                "id": str(course.id),
+                "title": course.title,
+                "code": course.code,
+                "category": course.category.value,
+                "sub_category": course.sub_category,
+                "description": course.description,
+                "sections": course.section_names,
+                "icon_url": course.icon_url,
+                "material_ids": course.material_ids,
+                "test_series_ids": course.test_series_ids,
+            }
+            for course in courses
+        ]
 
         return {
             "message": "Enrolled courses retrieved successfully",
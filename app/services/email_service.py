@@ -1,13 +1,37 @@
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
-from ..config import settings
+from typing import Awaitable, Callable, Optional
+from fastapi import BackgroundTasks
+from ..config import settings, IS_SERVERLESS
 
 logger = logging.getLogger(__name__)
 
 
 class EmailService:
+    @staticmethod
+    def _send_smtp(to_email: str, msg: MIMEMultipart) -> None:
+        """Blocking SMTP delivery, SSL first with a TLS fallback"""
+        # Try SSL first (recommended for Hostinger)
+        try:
+            with smtplib.SMTP_SSL(settings.SMTP_SERVER, 465, timeout=10) as server:
+                server.login(settings.SENDER_EMAIL, settings.SENDER_PASSWORD)
+                server.sendmail(settings.SENDER_EMAIL, to_email, msg.as_string())
+
+            print(f"✔ Email sent (SSL/465) → {to_email}")
+
+        except Exception:
+            print("⚠ SSL failed — retrying with TLS (587)")
+
+            with smtplib.SMTP(settings.SMTP_SERVER, 587, timeout=10) as server:
+                server.starttls()
+                server.login(settings.SENDER_EMAIL, settings.SENDER_PASSWORD)
+                server.sendmail(settings.SENDER_EMAIL, to_email, msg.as_string())
+
+            print(f"✔ Email sent (TLS/587) → {to_email}")
+
     @staticmethod
     async def send_email(to_email: str, subject: str, body: str) -> bool:
         """Send email using Hostinger SMTP with SSL first, fallback to TLS"""
@@ -25,31 +49,33 @@ class EmailService:
             msg["To"] = to_email
             msg.attach(MIMEText(body, "html"))
 
-            # Try SSL first (recommended for Hostinger)
-            try:
-                with smtplib.SMTP_SSL(settings.SMTP_SERVER, 465, timeout=10) as server:
-                    server.login(settings.SENDER_EMAIL, settings.SENDER_PASSWORD)
-                    server.sendmail(settings.SENDER_EMAIL, to_email, msg.as_string())
-
-                print(f"✔ Email sent (SSL/465) → {to_email}")
-                return True
-
-            except Exception:
-                print("⚠ SSL failed — retrying with TLS (587)")
-
-                with smtplib.SMTP(settings.SMTP_SERVER, 587, timeout=10) as server:
-                    server.starttls()
-                    server.login(settings.SENDER_EMAIL, settings.SENDER_PASSWORD)
-                    server.sendmail(settings.SENDER_EMAIL, to_email, msg.as_string())
-
-                print(f"✔ Email sent (TLS/587) → {to_email}")
-                return True
+            # smtplib blocks, so run it off the event loop
+            await asyncio.to_thread(EmailService._send_smtp, to_email, msg)
+            return True
 
         except Exception as e:
             print(f"❌ Email send failed: {e}")
             logger.error(f"Email error: {e}")
             return False
 
+    @staticmethod
+    async def deliver(
+        background_tasks: Optional[BackgroundTasks],
+        send: Callable[..., Awaitable[bool]],
+        *args,
+    ) -> bool:
+        """
+        Send an email after the response when running on a long-lived server.
+
+        Serverless instances are frozen once the response is returned, so there
+        (or when no BackgroundTasks is available) the send is awaited inline.
+        Returns True once queued, otherwise the result of the send.
+        """
+        if background_tasks is not None and not IS_SERVERLESS:
+            background_tasks.add_task(send, *args)
+            return True
+        return await send(*args)
+
     # -----------------------------------------------------------
     # HTML TEMPLATE (Universal Green + Yellow Theme)
     # -----------------------------------------------------------
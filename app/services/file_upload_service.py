@@ -2,6 +2,7 @@
 File upload service for DigitalOcean Spaces
 """
 
+import asyncio
 import boto3
 import uuid
 import re
@@ -36,15 +37,53 @@ class FileUploadService:
     MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB for images
     MAX_PDF_SIZE = 50 * 1024 * 1024  # 50MB for PDFs
 
+    # Read size for streamed uploads
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+    _s3_client = None
+
     @staticmethod
     def _get_s3_client():
-        """Get DigitalOcean Spaces S3 client"""
-        return boto3.client(
-            "s3",
-            endpoint_url=settings.DO_SPACES_ENDPOINT,
-            aws_access_key_id=settings.DO_SPACES_KEY,
-            aws_secret_access_key=settings.DO_SPACES_SECRET,
-            region_name=settings.DO_SPACES_REGION,
+        """Get the DigitalOcean Spaces S3 client, created once per process"""
+        # boto3 clients are thread-safe; building one costs far more than a request
+        if FileUploadService._s3_client is None:
+            FileUploadService._s3_client = boto3.client(
+                "s3",
+                endpoint_url=settings.DO_SPACES_ENDPOINT,
+                aws_access_key_id=settings.DO_SPACES_KEY,
+                aws_secret_access_key=settings.DO_SPACES_SECRET,
+                region_name=settings.DO_SPACES_REGION,
+            )
+        return FileUploadService._s3_client
+
+    @staticmethod
+    async def _read_limited(file: UploadFile, max_size: int) -> bytes:
+        """
+        Read an upload in chunks, rejecting it as soon as it exceeds max_size
+        (the client-reported size is optional and cannot be trusted).
+        """
+        buffer = bytearray()
+        while True:
+            chunk = await file.read(FileUploadService.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            if len(buffer) > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB",
+                )
+        return bytes(buffer)
+
+    @staticmethod
+    def _put_public_object(file_path: str, body: bytes, content_type: str) -> None:
+        """Blocking upload of a public-read object; run it off the event loop"""
+        FileUploadService._get_s3_client().put_object(
+            Bucket=settings.DO_SPACES_BUCKET,
+            Key=file_path,
+            Body=body,
+            ContentType=content_type,
+            ACL="public-read",
         )
 
     @staticmethod
@@ -225,9 +264,13 @@ class FileUploadService:
             else:
                 return False
 
-            # Delete from DigitalOcean Spaces
+            # Delete from DigitalOcean Spaces without blocking the event loop
             s3_client = FileUploadService._get_s3_client()
-            s3_client.delete_object(Bucket=settings.DO_SPACES_BUCKET, Key=file_path)
+            await asyncio.to_thread(
+                s3_client.delete_object,
+                Bucket=settings.DO_SPACES_BUCKET,
+                Key=file_path,
+            )
 
             return True
 
@@ -355,12 +398,14 @@ class FileUploadService:
             # Validate image
             FileUploadService._validate_image(file)
 
-            # Read file
-            file_content = await file.read()
+            # Read file in chunks, capped at the image size limit
+            file_content = await FileUploadService._read_limited(
+                file, FileUploadService.MAX_IMAGE_SIZE
+            )
 
-            # Optimize image (optional)
-            optimized_content = FileUploadService._optimize_image(
-                file_content, max_width=1600
+            # Optimize image (optional); PIL work is CPU-bound
+            optimized_content = await asyncio.to_thread(
+                FileUploadService._optimize_image, file_content, 1600
             )
 
             # Extension
@@ -370,14 +415,12 @@ class FileUploadService:
             unique_id = str(uuid.uuid4())[:10]
             file_path = f"banner/{name}_{unique_id}{file_extension}"
 
-            # Upload to DO
-            s3_client = FileUploadService._get_s3_client()
-            s3_client.put_object(
-                Bucket=settings.DO_SPACES_BUCKET,
-                Key=file_path,
-                Body=optimized_content,
-                ContentType=file.content_type,
-                ACL="public-read",
+            # Upload to DO without blocking the event loop
+            await asyncio.to_thread(
+                FileUploadService._put_public_object,
+                file_path,
+                optimized_content,
+                file.content_type,
             )
 
             # Return public URL
@@ -0,0 +1,62 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict
+
+from cachetools import TTLCache
+
+from ..config import settings
+
+# Decoded JWT payloads keyed by token digest. Entries never outlive the
+# token itself: the exp claim is re-checked on every hit.
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Digests of refresh tokens revoked by this process, kept for as long as a
+# refresh token can live. Mongo stays the source of truth across workers;
+# this only lets replays of a known-revoked token skip the session lookup.
+_revoked: TTLCache = TTLCache(
+    maxsize=50_000, ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+)
+
+
+def token_key(token: str) -> bytes:
+    """Compact, fixed-size cache key for a raw JWT string"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def get_or_decode(
+    token: str, decode: Callable[[str], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Return the verified payload for `token`, decoding it only on a miss.
+
+    Args:
+        token: Raw JWT string
+        decode: Function that verifies and decodes the token, raising on failure
+
+    Returns:
+        Dict[str, Any]: The decoded payload
+    """
+    key = token_key(token)
+    payload = _payload_cache.get(key)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is None or exp > time.time():
+            return payload
+        # Expired since it was cached; let decode raise the proper error
+        _payload_cache.pop(key, None)
+
+    payload = decode(token)
+    _payload_cache[key] = payload
+    return payload
+
+
+def revoke(token: str) -> None:
+    """Remember a revoked refresh token and forget its cached payload"""
+    key = token_key(token)
+    _payload_cache.pop(key, None)
+    _revoked[key] = True
+
+
+def is_revoked(token: str) -> bool:
+    """True if this process has seen the token revoked"""
+    return token_key(token) in _revoked
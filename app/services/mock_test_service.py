@@ -304,7 +304,7 @@ class MockTestService:
 
         # Create and save the TestAttempt
         test_attempt = TestAttempt(
-            user_id=str(current_user.id),
+            user_id=current_user.id_str,
             test_series_id=course_id,  # Using course_id as test_series_id for mock tests
             start_time=datetime.now(timezone.utc)
             - timedelta(seconds=time_spent_seconds or 0),
@@ -332,7 +332,7 @@ class MockTestService:
                     "title": course.title,
                     "code": course.code,
                 },
-                "user_id": str(current_user.id),
+                "user_id": current_user.id_str,
                 "time_spent_seconds": time_spent_seconds or 0,
                 "total_questions": total_questions,
                 "attempted_questions": attempted,
@@ -1,6 +1,8 @@
+import hmac
 import secrets
 import string
 from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 
 
 class OTPService:
@@ -15,16 +17,56 @@ class OTPService:
         return datetime.now(timezone.utc) + timedelta(minutes=minutes)
 
     @staticmethod
-    def is_otp_expired(expiry_time: datetime) -> bool:
+    def otp_matches(stored_otp: Optional[str], provided_otp: Any) -> bool:
+        """
+        Compare a stored OTP with user input in constant time.
+
+        Args:
+            stored_otp: The OTP saved on the user document, if any
+            provided_otp: The OTP submitted by the client
+
+        Returns:
+            bool: True if an OTP is stored and the two values match
+        """
+        if not stored_otp or provided_otp is None:
+            return False
+        return hmac.compare_digest(stored_otp.encode(), str(provided_otp).encode())
+
+    @staticmethod
+    def verify_otp(
+        stored_otp: Optional[str], expiry_time: Optional[datetime], provided_otp: Any
+    ) -> bool:
+        """
+        Check a submitted OTP, testing expiry before touching the stored code.
+
+        Expired, missing and mismatched OTPs all return False so callers can
+        answer with one generic error.
+
+        Args:
+            stored_otp: The OTP saved on the user document, if any
+            expiry_time: When the stored OTP expires
+            provided_otp: The OTP submitted by the client
+
+        Returns:
+            bool: True if the OTP is still valid and matches
+        """
+        if OTPService.is_otp_expired(expiry_time):
+            return False
+        return OTPService.otp_matches(stored_otp, provided_otp)
+
+    @staticmethod
+    def is_otp_expired(expiry_time: Optional[datetime]) -> bool:
         """
         Check if OTP has expired, handling both timezone-aware and timezone-naive datetimes.
 
         Args:
-            expiry_time: The expiry datetime to check
+            expiry_time: The expiry datetime to check; a missing expiry counts as expired
 
         Returns:
             bool: True if OTP has expired, False otherwise
         """
+        if expiry_time is None:
+            return True
         now = datetime.now(timezone.utc)
         if expiry_time.tzinfo is None:
             expiry_time = expiry_time.replace(tzinfo=timezone.utc)
@@ -2,6 +2,7 @@
 Section service for course section management operations
 """
 
+import logging
 from typing import Dict, Any, List, Optional
 from bson import ObjectId
 
@@ -11,6 +12,8 @@ from ..models.admin_action import AdminAction, ActionType
 from ..models.user import User
 from .admin_service import AdminService
 
+logger = logging.getLogger(__name__)
+
 
 class SectionService:
     """Service class for course section management operations"""
@@ -59,7 +62,7 @@ class SectionService:
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.CREATE,
             "courses",
             course_id,
@@ -138,7 +141,7 @@ class SectionService:
 
         # Log admin action
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.UPDATE,
             "courses",
             course_id,
@@ -175,67 +178,43 @@ class SectionService:
         if not ObjectId.is_valid(course_id):
             raise ValueError("Invalid course ID format")
 
-        print(f"🔍 delete_section_from_course called with: course_id={course_id}, section_name='{section_name}'")
-
         # Get the course
         course = await Course.get(course_id)
         if not course:
             raise ValueError("Course not found")
 
-        print(f"🔍 Course found: {course.title} with sections: {course.sections}")
-
         # Find the section
         section = course.get_section(section_name)
-        print(f"🔍 Searching for section: '{section_name}' -> found: {section}")
-
         if not section:
-            print(f"❌ Section '{section_name}' not found in course")
             raise ValueError(f"Section '{section_name}' not found")
 
-        print(f"✅ Section found, proceeding with deletion")
-
         # Delete all questions in this section
         deleted_questions = await Question.find(
             {"course_id": course_id, "section": section_name}
         ).delete_many()
-        print(f"🔍 Deleted {deleted_questions} questions from section '{section_name}'")
 
         # Extract the count from DeleteResult (MongoDB returns deleted_count or n)
         deleted_count = getattr(deleted_questions, 'deleted_count', getattr(deleted_questions, 'n', 0))
-        print(f"🔍 Extracted deleted count: {deleted_count}")
 
         # Remove section from course
-        print(f"🔍 Before deletion: course.sections length = {len(course.sections)}")
-        print(f"🔍 Before deletion: course.sections = {course.sections}")
-
         if course.sections and isinstance(course.sections[0], str):
             # Sections are stored as strings
-            print(f"🔍 Removing string section: '{section_name}'")
             course.sections = [s for s in course.sections if s != section_name]
-            print(f"🔍 After string removal: course.sections = {course.sections}")
         elif course.sections:
             # Sections are Section objects
-            print(f"🔍 Removing object section: '{section_name}'")
             course.sections = [s for s in course.sections if s.name != section_name]
-            print(f"🔍 After object removal: course.sections = {[s.name for s in course.sections]}")
 
         # Update order of remaining sections only if they are Section objects
-        print(f"🔍 After deletion: course.sections length = {len(course.sections)}")
         if course.sections and not isinstance(course.sections[0], str):
-            print(f"🔍 Reordering remaining sections...")
             for i, remaining_section in enumerate(course.sections):
-                print(f"🔍 Setting order for section '{remaining_section.name}': {i + 1}")
                 remaining_section.order = i + 1
 
-        print(f"🔍 Saving course...")
         course.update_timestamp()
         await course.save()
-        print(f"✅ Course saved successfully")
 
         # Log admin action
-        print(f"🔍 Logging admin action...")
         await AdminService.log_admin_action(
-            str(current_user.id),
+            current_user.id_str,
             ActionType.DELETE,
             "courses",
             course_id,
@@ -245,15 +224,18 @@ class SectionService:
                 "deleted_questions_count": deleted_count,
             },
         )
-        print(f"✅ Admin action logged")
 
-        result = {
+        logger.debug(
+            "Deleted section %r and %d questions from course %s",
+            section_name,
+            deleted_count,
+            course_id,
+        )
+        return {
             "message": f"Section '{section_name}' and {deleted_count} questions deleted successfully",
             "course_id": course_id,
             "deleted_questions_count": deleted_count,
         }
-        print(f"🔍 Returning result: {result}")
-        return result
 
     @staticmethod
     async def list_course_sections(course_id: str) -> Dict[str, Any]:
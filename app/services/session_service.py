@@ -1,7 +1,12 @@
-from typing import Dict, Any, List, Optional
+import logging
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
-from ..models.user_session import UserSession
+from beanie import BulkWriter, PydanticObjectId
+from ..models.user_session import UserSession, UserSessionView
 from ..db import init_beanie_if_needed
+from . import jwt_cache
+
+logger = logging.getLogger(__name__)
 
 
 class SessionService:
@@ -68,25 +73,120 @@ class SessionService:
         return session
 
     @staticmethod
-    async def validate_session(refresh_token: str) -> Optional[UserSession]:
+    def client_info(request) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Read the user agent and client IP straight from the ASGI scope,
+        skipping the construction of Starlette's Headers mapping.
+        """
+        if request is None:
+            return None, None
+        scope = request.scope
+        user_agent = next(
+            (
+                value.decode("latin-1")
+                for key, value in scope.get("headers", ())
+                if key == b"user-agent"
+            ),
+            None,
+        )
+        client = scope.get("client")
+        ip_address = client[0] if client else None
+        return user_agent, ip_address
+
+    @staticmethod
+    async def create_session_from_request(
+        user_id: str, refresh_token: str, request=None
+    ) -> Optional[UserSession]:
+        """
+        Create a session for a freshly issued refresh token, taking device
+        info from the request. Failures are logged rather than raised so
+        that they never block a login.
+        """
+        user_agent, ip_address = SessionService.client_info(request)
+        try:
+            return await SessionService.create_session(
+                user_id=user_id,
+                refresh_token=refresh_token,
+                user_agent=user_agent,
+                ip_address=ip_address,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create session for user {user_id}: {str(e)}")
+            return None
+
+    @staticmethod
+    async def validate_session(
+        refresh_token: str, update_activity: bool = True
+    ) -> Optional[UserSession]:
         """Validate if a refresh token corresponds to an active session"""
+        # Known-revoked tokens are rejected without a database round trip
+        if jwt_cache.is_revoked(refresh_token):
+            return None
+
         await init_beanie_if_needed()
 
         session = await UserSession.find_active_session_by_refresh_token(refresh_token)
 
-        if session:
+        if session and update_activity:
             # Update activity timestamp
             session.update_activity()
             await session.save()
 
         return session
 
+    @staticmethod
+    async def rotate_session(
+        old_session: UserSession,
+        old_refresh_token: str,
+        new_refresh_token: str,
+        user_agent: str = None,
+        ip_address: str = None
+    ) -> UserSession:
+        """
+        Deactivate a session and create its replacement for a new refresh token.
+
+        Both writes go to Mongo in a single bulk_write round trip.
+        """
+        await init_beanie_if_needed()
+
+        new_session = UserSession.create_from_refresh_token(
+            user_id=old_session.user_id,
+            refresh_token=new_refresh_token,
+            device_info=SessionService.extract_device_info(user_agent, ip_address),
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        # Assign the id up front since bulk inserts don't report it back
+        new_session.id = PydanticObjectId()
+        # Set expiry to 7 days from now (same as refresh token)
+        new_session.expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+
+        old_session.deactivate()
+
+        async with BulkWriter(ordered=False) as bulk_writer:
+            await UserSession.find_one({"_id": old_session.id}).update(
+                {
+                    "$set": {
+                        "is_active": False,
+                        "activity_log": old_session.activity_log,
+                    }
+                },
+                bulk_writer=bulk_writer,
+            )
+            await UserSession.insert_one(new_session, bulk_writer=bulk_writer)
+
+        jwt_cache.revoke(old_refresh_token)
+        new_session.add_activity_log("session_created", "New session created")
+
+        return new_session
+
     @staticmethod
     async def blacklist_refresh_token(refresh_token: str) -> bool:
         """Blacklist a refresh token by deactivating its session"""
         await init_beanie_if_needed()
 
         success = await UserSession.blacklist_refresh_token(refresh_token)
+        jwt_cache.revoke(refresh_token)
 
         if success:
             print(f"🔒 Refresh token blacklisted successfully")
@@ -115,6 +215,22 @@ class SessionService:
         else:
             return await UserSession.find({"user_id": user_id}).sort([("last_activity", -1)]).to_list()
 
+    @staticmethod
+    async def get_user_session_views(
+        user_id: str, active_only: bool = True
+    ) -> List[UserSessionView]:
+        """Get lightweight session projections for listing, newest activity first"""
+        await init_beanie_if_needed()
+
+        query: Dict[str, Any] = {"user_id": user_id}
+        if active_only:
+            query["is_active"] = True
+        return (
+            await UserSession.find(query, projection_model=UserSessionView)
+            .sort([("last_activity", -1)])
+            .to_list()
+        )
+
     @staticmethod
     async def cleanup_expired_sessions() -> int:
         """Clean up expired sessions (should be run periodically)"""
@@ -132,8 +248,8 @@ class SessionService:
         """Get session statistics for a user"""
         await init_beanie_if_needed()
 
-        all_sessions = await SessionService.get_user_sessions(user_id, active_only=False)
-        active_sessions = await SessionService.get_user_sessions(user_id, active_only=True)
+        all_sessions = await SessionService.get_user_session_views(user_id, active_only=False)
+        active_sessions = [s for s in all_sessions if s.is_active]
 
         # Group sessions by device type
         device_types = {}
@@ -155,7 +271,7 @@ class SessionService:
         """Check if user has exceeded concurrent session limit"""
         await init_beanie_if_needed()
 
-        active_sessions = await SessionService.get_user_sessions(user_id, active_only=True)
+        active_sessions = await SessionService.get_user_session_views(user_id)
 
         return {
             "current_sessions": len(active_sessions),
@@ -169,7 +285,7 @@ class SessionService:
         """Enforce session limit by removing oldest sessions"""
         await init_beanie_if_needed()
 
-        active_sessions = await SessionService.get_user_sessions(user_id, active_only=True)
+        active_sessions = await SessionService.get_user_session_views(user_id)
 
         if len(active_sessions) < max_sessions:
             return []
@@ -177,11 +293,9 @@ class SessionService:
         # Sort by last activity (oldest first)
         sessions_to_remove = sorted(active_sessions, key=lambda s: s.last_activity)[:-max_sessions + 1]
 
-        removed_session_ids = []
-        for session in sessions_to_remove:
-            session.deactivate()
-            await session.save()
-            removed_session_ids.append(str(session.id))
+        # Deactivate them all in one update instead of a save per session
+        await UserSession.deactivate_sessions([s.id for s in sessions_to_remove])
+        removed_session_ids = [str(s.id) for s in sessions_to_remove]
 
         if removed_session_ids:
             print(f"🔧 Enforced session limit for user {user_id}, removed {len(removed_session_ids)} sessions")
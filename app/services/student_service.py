@@ -135,8 +135,11 @@ class StudentService:
 
         # Only update if there are changes
         if changes:
+            from ..auth import AuthService
+
             student.update_timestamp()
             await student.save()
+            AuthService.invalidate_cached_user(student.email)
 
         return student, changes
 
@@ -160,9 +163,13 @@ class StudentService:
             return False
 
         # Soft delete by setting is_active=False
+        from ..auth import AuthService
+
         student.is_active = False
         student.update_timestamp()
         await student.save()
+        # Authenticated requests must stop being served from the user cache
+        AuthService.invalidate_cached_user(student.email)
 
         return True
 
@@ -192,9 +199,10 @@ class StudentService:
             )
 
         # Update password
-        student.password_hash = AuthService.get_password_hash(new_password)
+        student.password_hash = await AuthService.aget_password_hash(new_password)
         student.update_timestamp()
         await student.save()
+        AuthService.invalidate_cached_user(student.email)
 
         return True
 
@@ -248,7 +256,7 @@ class StudentService:
             "weakest_subjects": analytics.weakest_subjects,
             # Time and engagement
             "total_study_time_minutes": analytics.total_study_time_minutes,
-            "study_habits": analytics.study_habits.dict(),
+            "study_habits": analytics.study_habits.model_dump(),
             "materials_accessed": analytics.materials_accessed,
             "materials_completed": analytics.materials_completed,
             # Detailed breakdowns
@@ -1,8 +1,12 @@
 from typing import List, Dict, Any, Callable, Optional, TypeVar, Union, Tuple
 from datetime import datetime, timezone
+from bson import ObjectId
 from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
 import asyncio
 import hashlib
+import orjson
 
 T = TypeVar("T")
 
@@ -150,6 +154,35 @@ def format_response(
     return response
 
 
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError
+
+
+def json_response(content: Dict[str, Any], status_code: int = 200) -> Response:
+    """Encode a response dict straight to JSON bytes
+
+    Returning a Response skips the endpoint's response_model pass, which
+    would walk large payloads (course listings, question sets) once more
+    before ORJSONResponse encodes them.
+
+    Args:
+        content: Response body
+        status_code: HTTP status, since the route's default is bypassed too
+
+    Returns:
+        Response with the orjson-encoded body
+    """
+    return Response(
+        orjson.dumps(content, default=_orjson_default),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 def safe_get_attr(obj: Any, attr: str, default: Any = None) -> Any:
     """Safely get an attribute from an object, return default if not found
 
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from beanie import init_beanie
+from pymongo import AsyncMongoClient
+
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+# Settings are read at import time; unit tests never reach these services
+for key, value in {
+    "MONGO_URI": "mongodb://localhost:27017/test",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "DO_SPACES_ENDPOINT": "http://localhost",
+    "DO_SPACES_KEY": "test",
+    "DO_SPACES_SECRET": "test",
+    "DO_SPACES_BUCKET": "test",
+    "DO_SPACES_CDN_ENDPOINT": "http://localhost",
+    "RAZORPAY_KEY_ID": "test",
+    "RAZORPAY_KEY_SECRET": "test",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def beanie_models():
+    """
+    Initialise the Beanie models against a client that is never connected,
+    so documents can be built; tests replace the queries they exercise.
+    """
+    from app.models.admin_action import AdminAction
+    from app.models.course import Course
+    from app.models.question import Question
+    from app.models.user import User
+
+    database = AsyncMongoClient("mongodb://localhost:27017", connect=False)["test"]
+
+    async def command(*args, **kwargs):
+        return {"version": "7.0.0"}
+
+    database.command = command
+    asyncio.run(
+        init_beanie(
+            database=database,
+            document_models=[User, Course, Question, AdminAction],
+            skip_indexes=True,
+        )
+    )
@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.routers import contact
+
+
+@pytest.fixture(autouse=True)
+def reset_batch(monkeypatch):
+    monkeypatch.setattr(contact, "_pending_contacts", [])
+    monkeypatch.setattr(contact, "_flush_task", None)
+    monkeypatch.setattr(contact, "_BATCH_WINDOW_SECONDS", 0)
+
+
+def test_partial_bulk_failure_only_fails_rejected_submissions(monkeypatch):
+    async def insert_many(documents, ordered=True):
+        raise BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate"}]}
+        )
+
+    monkeypatch.setattr(contact.Contact, "insert_many", insert_many)
+
+    async def submit_three():
+        return await asyncio.gather(
+            *(contact._insert_batched(SimpleNamespace()) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(submit_three())
+    assert results[0] is None
+    assert isinstance(results[1], BulkWriteError)
+    assert results[2] is None
+
+
+def test_stale_flush_task_from_another_loop_is_discarded(monkeypatch):
+    written = []
+
+    async def insert_many(documents, ordered=True):
+        written.extend(documents)
+
+    monkeypatch.setattr(contact.Contact, "insert_many", insert_many)
+
+    # A flush scheduled on a loop that then went away never runs
+    async def queue_and_abandon():
+        contact._pending_contacts.append((SimpleNamespace(), asyncio.Future()))
+        contact._flush_task = asyncio.create_task(asyncio.sleep(3600))
+
+    stale_loop = asyncio.new_event_loop()
+    stale_loop.run_until_complete(queue_and_abandon())
+
+    submitted = SimpleNamespace()
+    asyncio.run(asyncio.wait_for(contact._insert_batched(submitted), timeout=1))
+    assert written == [submitted]
+
+    for task in asyncio.all_tasks(stale_loop):
+        task.cancel()
+    stale_loop.run_until_complete(asyncio.sleep(0))
+    stale_loop.close()
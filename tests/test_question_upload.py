@@ -0,0 +1,97 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.course import Course
+from app.models.question import Question
+from app.services import course_question_service
+from app.services.admin_service import AdminService
+from app.services.course_question_service import CourseQuestionService
+
+COURSE_ID = "5f0000000000000000000000"
+
+
+class FakeQuestions:
+    """In-memory stand-in for the questions collection"""
+
+    def __init__(self):
+        self.documents = []
+
+    async def insert_many(self, documents, ordered=True):
+        await asyncio.sleep(0)
+        self.documents.extend(documents)
+
+    async def delete_many(self, query):
+        self.documents = [
+            doc
+            for doc in self.documents
+            if any(doc.get(key) != value for key, value in query.items())
+        ]
+
+
+@pytest.fixture
+def questions(monkeypatch):
+    stored = FakeQuestions()
+
+    async def find_course(query, projection):
+        return {"_id": query["_id"], "has_section": True}
+
+    async def log_admin_action(*args, **kwargs):
+        return None
+
+    courses = SimpleNamespace(find_one=find_course)
+    monkeypatch.setattr(
+        Course, "get_pymongo_collection", classmethod(lambda cls: courses)
+    )
+    monkeypatch.setattr(
+        Question, "get_pymongo_collection", classmethod(lambda cls: stored)
+    )
+    monkeypatch.setattr(AdminService, "log_admin_action", log_admin_action)
+    monkeypatch.setattr(course_question_service, "CSV_CHUNK_ROWS", 2)
+    return stored
+
+
+def upload(csv_bytes: bytes):
+    return asyncio.run(
+        CourseQuestionService.upload_questions_to_section(
+            COURSE_ID,
+            "Physics",
+            io.BytesIO(csv_bytes),
+            SimpleNamespace(id_str="admin-1"),
+        )
+    )
+
+
+def csv_rows(count: int) -> bytes:
+    lines = ["question,option_a,option_b,correct_answer"]
+    lines += [f"Question {i},a,b,A" for i in range(count)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_upload_inserts_every_row_in_chunks(questions):
+    result = upload(csv_rows(5))
+
+    assert result["count"] == 5
+    assert [doc["title"] for doc in questions.documents] == [
+        f"Question {i}" for i in range(5)
+    ]
+
+
+def test_invalid_utf8_near_the_end_leaves_no_questions_behind(questions):
+    body = csv_rows(9) + b"Question \xff\xfe,a,b,A\n"
+
+    with pytest.raises(UnicodeDecodeError):
+        upload(body)
+
+    assert questions.documents == []
+
+
+def test_rollback_keeps_other_uploads(questions):
+    upload(csv_rows(3))
+
+    with pytest.raises(UnicodeDecodeError):
+        upload(csv_rows(9) + b"\xff\n")
+
+    assert len(questions.documents) == 3
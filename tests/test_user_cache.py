@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from cachetools import TTLCache
+
+from app import auth
+from app.auth import AuthService
+from app.models.enums import ExamCategory, UserRole
+from app.models.user import User
+from app.routers import auth as auth_router
+from app.services.student_service import StudentService
+
+
+def make_user(**fields) -> User:
+    return User(
+        name="Test Student",
+        email="student@example.com",
+        phone="9999999999",
+        password_hash="hash",
+        **fields,
+    )
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Serve users from a dict and count how often Mongo would be hit"""
+    users = {}
+    calls = []
+
+    async def find_one(query, *args, **kwargs):
+        calls.append(query)
+        user = users.get(query.get("email"))
+        return user.model_copy(deep=True) if user else None
+
+    async def no_init():
+        return None
+
+    monkeypatch.setattr(auth, "_user_cache", TTLCache(maxsize=100, ttl=30))
+    monkeypatch.setattr(auth, "_user_cache_revoked", TTLCache(maxsize=100, ttl=30))
+    monkeypatch.setattr(auth, "init_beanie_if_needed", no_init)
+    monkeypatch.setattr(User, "find_one", find_one)
+    return SimpleNamespace(users=users, calls=calls)
+
+
+def token_for(user: User) -> str:
+    return AuthService.create_token_pair(user.email, user.role).access_token
+
+
+def test_cache_hit_skips_lookup_and_hands_out_private_copies(lookups):
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+
+    first = asyncio.run(AuthService.get_current_user(token))
+    # A handler mutating its user must not leak into the next request
+    first.name = "Changed"
+    first.preferred_exam_categories.append("medical")
+
+    second = asyncio.run(AuthService.get_current_user(token))
+    assert len(lookups.calls) == 1
+    assert second is not first
+    assert second.name == "Test Student"
+    assert second.preferred_exam_categories == []
+
+
+def test_logout_revokes_cached_user(lookups, monkeypatch):
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+
+    async def invalidate_all_user_sessions(user_id):
+        return 1
+
+    monkeypatch.setattr(
+        auth_router.SessionService,
+        "invalidate_all_user_sessions",
+        invalidate_all_user_sessions,
+    )
+
+    current = asyncio.run(AuthService.get_current_user(token))
+    asyncio.run(auth_router.logout(current_user=current))
+    asyncio.run(AuthService.get_current_user(token))
+    assert len(lookups.calls) == 2
+
+    asyncio.run(auth_router.logout_all_devices(current_user=current))
+    asyncio.run(AuthService.get_current_user(token))
+    assert len(lookups.calls) == 3
+
+
+def test_password_change_revokes_cached_user(lookups, monkeypatch):
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+    current = asyncio.run(AuthService.get_current_user(token))
+
+    class Update:
+        async def update(self, *args, **kwargs):
+            user.password_hash = "new-hash"
+
+    async def verify_password(plain, hashed):
+        return True
+
+    async def hash_password(password):
+        return "new-hash"
+
+    find_one = User.find_one
+    monkeypatch.setattr(User, "find_one", lambda *a, **k: Update())
+    monkeypatch.setattr(AuthService, "averify_password", verify_password)
+    monkeypatch.setattr(AuthService, "aget_password_hash", hash_password)
+    asyncio.run(
+        auth_router.change_password(
+            SimpleNamespace(current_password="old", new_password="N3w-password!"),
+            current_user=current,
+        )
+    )
+    monkeypatch.setattr(User, "find_one", find_one)
+
+    fresh = asyncio.run(AuthService.get_current_user(token))
+    assert fresh.password_hash == "new-hash"
+    assert len(lookups.calls) == 2
+
+
+def test_profile_update_is_not_served_stale(lookups, monkeypatch):
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+    asyncio.run(AuthService.get_current_user(token))
+
+    class Update:
+        async def update(self, *args, **kwargs):
+            user.preferred_exam_categories = [ExamCategory.MEDICAL]
+
+    find_one = User.find_one
+    monkeypatch.setattr(User, "find_one", lambda *a, **k: Update())
+    current = make_user()
+    asyncio.run(
+        AuthService.update_user_fields(
+            current, {"preferred_exam_categories": ["medical"]}
+        )
+    )
+    monkeypatch.setattr(User, "find_one", find_one)
+
+    fresh = asyncio.run(AuthService.get_current_user(token))
+    assert fresh.preferred_exam_categories == [ExamCategory.MEDICAL]
+    assert len(lookups.calls) == 2
+
+
+def test_admin_deactivation_revokes_cached_user(lookups, monkeypatch):
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+    asyncio.run(AuthService.get_current_user(token))
+
+    student = make_user(role=UserRole.STUDENT)
+
+    async def get_student_by_id(student_id):
+        return student
+
+    async def save(self, *args, **kwargs):
+        lookups.users[self.email] = self
+
+    monkeypatch.setattr(StudentService, "get_student_by_id", get_student_by_id)
+    monkeypatch.setattr(User, "save", save)
+    assert asyncio.run(StudentService.deactivate_student("id"))
+
+    with pytest.raises(auth.HTTPException) as exc:
+        asyncio.run(AuthService.get_current_user(token))
+    assert exc.value.detail == "Inactive user"
+
+
+def test_cached_user_expires(lookups, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(
+        auth, "_user_cache", TTLCache(maxsize=100, ttl=30, timer=lambda: clock[0])
+    )
+    user = make_user()
+    lookups.users[user.email] = user
+    token = token_for(user)
+
+    asyncio.run(AuthService.get_current_user(token))
+    asyncio.run(AuthService.get_current_user(token))
+    assert len(lookups.calls) == 1
+
+    clock[0] += 31
+    asyncio.run(AuthService.get_current_user(token))
+    assert len(lookups.calls) == 2
@@ -0,0 +1,56 @@
+import asyncio
+import warnings
+
+from beanie import PydanticObjectId
+
+from app.auth import AuthService
+from app.models.enums import ExamCategory
+from app.models.user import User
+from app.routers import auth as auth_router
+
+
+def make_user(**fields) -> User:
+    return User(
+        id=PydanticObjectId(),
+        name="Test Student",
+        email="student@example.com",
+        phone="9999999999",
+        password_hash="hash",
+        **fields,
+    )
+
+
+def test_memoised_response_tracks_replaced_list_entries():
+    user = make_user(enrolled_courses=["course-a"])
+    assert AuthService.convert_user_to_response(user).enrolled_courses == ["course-a"]
+
+    # Same length, different entry
+    user.enrolled_courses[0] = "course-b"
+    assert AuthService.convert_user_to_response(user).enrolled_courses == ["course-b"]
+
+
+def test_unchanged_user_reuses_response():
+    user = make_user()
+    first = AuthService.convert_user_to_response(user)
+    assert AuthService.convert_user_to_response(user) is first
+
+
+def test_response_after_profile_update_holds_enums(monkeypatch):
+    user = make_user()
+
+    class Update:
+        async def update(self, *args, **kwargs):
+            return None
+
+    monkeypatch.setattr(User, "find_one", lambda *a, **k: Update())
+    request = auth_router.ProfileUpdateRequest(preferred_exam_categories=["medical"])
+    response = asyncio.run(auth_router.update_profile(request, current_user=user))
+
+    assert response.preferred_exam_categories == [ExamCategory.MEDICAL]
+    assert all(
+        type(category) is ExamCategory
+        for category in response.preferred_exam_categories
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response.model_dump_json()